@@ -67,6 +67,12 @@ class CanBus():
         else:
             self.caninterface = caninterface_raw.SocketCanRawInterface(str(interfacename), timeout)
 
+        self._init_storages()
+
+        logging.debug("Initialized {}".format(repr(self)))
+
+    def _init_storages(self):
+        """Sort the frame definitions into inbound and outbound, and set default values in the outgoing frames."""
         # Dict of signaldefinition objects for outgoing signals. Keys are signalnames (str).
         self._output_signaldefinition_storage = {}
 
@@ -83,7 +89,7 @@ class CanBus():
         self._transmissionstatus = {}
 
         for frameID, framedef in self._configuration.framedefinitions.items():
-            if framedef.is_outbound(config.ego_node_ids):
+            if framedef.is_outbound(self._configuration.ego_node_ids):
                 self._output_framedefinition_storage[frameID] = framedef
 
                 if framedef.cycletime in [0, None]:
@@ -99,8 +105,6 @@ class CanBus():
             else:
                 self._input_framedefinition_storage.append(framedef)
 
-        logging.debug("Initialized {}".format(repr(self)))
-
     @classmethod
     def from_kcd_file(cls, filename, interfacename, timeout=None, busname=None, use_bcm=False, ego_node_ids=None):
         """
@@ -181,6 +185,20 @@ class CanBus():
         """
         return self.caninterface.recv_next_frame()
 
+    def reset(self):
+        """Return to the state after construction, without reopening the socket.
+
+        Stops periodic sending and receiving when using the BCM, and removes the receive filters when using RAW.
+        Frames waiting in the receive queue are discarded, and the outgoing signals are set to their default values.
+
+        """
+        if self._use_bcm:
+            self.stop()
+        else:
+            self.caninterface.clear_receive_filters()
+        self.caninterface.flush_receive_queue()
+        self._init_storages()
+
     def stop_reception(self):
         """Stop receiving, when using the BCM."""
         if not self._use_bcm:
@@ -221,17 +239,16 @@ class CanBus():
         else:
             raise exceptions.CanException("No arguments given.")
 
-        frames_to_send = set()
-        for signalname, value in signals_to_send.items():
-            try:
-                signaldefinition = self._output_signaldefinition_storage[signalname]
-            except KeyError:
-                raise exceptions.CanException("This signalname is unknown: {}. Is it defined as outbound?".
-                                              format(signalname))
-            frame = self._output_frame_storage[signalname]
-            frame.set_signalvalue(signaldefinition, value)  # Will raise CanException if failing
-            frames_to_send.add(frame)
+        frames_to_send = self._update_output_frames(signals_to_send)
+        self._send_updated_frames(frames_to_send)
 
+    def _send_updated_frames(self, frames_to_send):
+        """Send frames from the outgoing frame storage, using periodic transmission if using the BCM.
+
+        Args:
+         frames_to_send (iterable of :class:`.CanFrame`): The frames to send.
+
+        """
         if self._use_bcm:
             for frame in frames_to_send:
                 status = self._transmissionstatus[frame.frame_id]
@@ -250,6 +267,110 @@ class CanBus():
             for frame in frames_to_send:
                 self.caninterface.send_frame(frame)
 
+    def send_signals_batch(self, list_of_signals_to_send):
+        """Send CAN signals in a sequence of frames.
+
+        Args:
+         list_of_signals_to_send (list of dict): Each dict has the same format as in :meth:`.send_signals`.
+           The dicts are handled in order.
+
+        With the RAW protocol the resulting frames are handed to the kernel in as few system calls as possible.
+        With the BCM protocol this is equal to calling :meth:`.send_signals` once per dict.
+
+        Raises:
+          CanException: When failing to set signal value etc. See :exc:`.CanException`.
+
+        """
+        if self._use_bcm:
+            for signals_to_send in list_of_signals_to_send:
+                self.send_signals(signals_to_send)
+            return
+
+        frames_to_send = []
+        for signals_to_send in list_of_signals_to_send:
+            if not isinstance(signals_to_send, dict):
+                raise exceptions.CanException("Each item should be a dictionary, not: {!r}".format(signals_to_send))
+            for frame in self._update_output_frames(signals_to_send):
+                # Copy, as the stored frame will be modified by next item
+                frames_to_send.append(canframe.CanFrame(frame.frame_id, frame.frame_data, frame.frame_format))
+        self.caninterface.send_frames(frames_to_send)
+
+    def send_signal_sequences(self, signal_sequences):
+        """Send CAN signals in a sequence of frames, given one sequence of values per signal.
+
+        Args:
+         signal_sequences (dict): The keys are the signalnames (*str*), and the items are sequences of values
+           (for example lists, ranges or :class:`array.array` objects). All sequences must have the same length.
+
+        This gives the same frames as :meth:`.send_signals_batch`, but each signal name is looked up once
+        instead of once per frame. For example::
+
+            mycanbus.send_signal_sequences({"VehicleSpeed": [70.3, 70.4, 70.6], "EngineSpeed": [2821, 2830, 2838]})
+
+        Raises:
+          CanException: When failing to set signal value etc. See :exc:`.CanException`.
+
+        """
+        try:
+            signal_sequences_items = signal_sequences.items()
+        except AttributeError:
+            raise exceptions.CanException("The argument should be a dictionary, not: {!r}".format(signal_sequences))
+
+        columns = []
+        lengths = set()
+        for signalname, values in signal_sequences_items:
+            try:
+                signaldefinition = self._output_signaldefinition_storage[signalname]
+            except KeyError:
+                raise exceptions.CanException("This signalname is unknown: {}. Is it defined as outbound?".
+                                              format(signalname))
+            try:
+                lengths.add(len(values))
+            except TypeError:
+                raise exceptions.CanException("The values for signal {} should be a sequence, not: {!r}".format(
+                                              signalname, values))
+            columns.append((signaldefinition, self._output_frame_storage[signalname], values))
+        if len(lengths) > 1:
+            raise exceptions.CanException("The signal value sequences have different lengths: {}".format(
+                                          sorted(lengths)))
+
+        frames_to_send = []
+        for i in range(lengths.pop() if lengths else 0):
+            updated_frames = set()
+            for signaldefinition, frame, values in columns:
+                frame.set_signalvalue(signaldefinition, values[i])  # Will raise CanException if failing
+                updated_frames.add(frame)
+
+            if self._use_bcm:
+                self._send_updated_frames(updated_frames)
+            else:
+                for frame in updated_frames:
+                    # Copy, as the stored frame will be modified by next item
+                    frames_to_send.append(canframe.CanFrame(frame.frame_id, frame.frame_data, frame.frame_format))
+        if frames_to_send:
+            self.caninterface.send_frames(frames_to_send)
+
+    def _update_output_frames(self, signals_to_send):
+        """Set signal values in the stored outgoing frames.
+
+        Args:
+         signals_to_send (dict): The keys are the signalnames (*str*), and the items are the values.
+
+        Returns the set of modified frames (:class:`.CanFrame` objects).
+
+        """
+        frames_to_send = set()
+        for signalname, value in signals_to_send.items():
+            try:
+                signaldefinition = self._output_signaldefinition_storage[signalname]
+            except KeyError:
+                raise exceptions.CanException("This signalname is unknown: {}. Is it defined as outbound?".
+                                              format(signalname))
+            frame = self._output_frame_storage[signalname]
+            frame.set_signalvalue(signaldefinition, value)  # Will raise CanException if failing
+            frames_to_send.add(frame)
+        return frames_to_send
+
     def start_sending_all_signals(self):
         """Start sending all configured frames, when using the BCM.
 
@@ -25,12 +25,34 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # 
 
+import functools
+import math
+import multiprocessing
 import struct
 
 from . import exceptions
 from . import constants
 from . import utilities
 
+_RAWFRAME_STRUCT = struct.Struct(constants.FORMAT_CAN_RAWFRAME)
+_DATA_BIG_STRUCT = struct.Struct(constants.FORMAT_DATA_LONGLONG)
+_DATA_LITTLE_STRUCT = struct.Struct(constants.FORMAT_DATA_LONGLONG_LITTLE_ENDIAN)
+_FLOAT_SINGLE_STRUCT = struct.Struct(constants.FORMAT_FLOAT_SINGLE_BIG_ENDIAN)
+_FLOAT_SINGLE_LITTLE_STRUCT = struct.Struct(constants.FORMAT_FLOAT_SINGLE_LITTLE_ENDIAN)
+_MAX_FRAME_ID = {constants.CAN_FRAMEFORMAT_STANDARD: constants.MAX_CAN_FRAME_ID_STANDARD,
+                 constants.CAN_FRAMEFORMAT_EXTENDED: constants.MAX_CAN_FRAME_ID_EXTENDED}
+_FLOAT_DOUBLE_STRUCTS = {constants.LITTLE_ENDIAN: struct.Struct(constants.FORMAT_FLOAT_DOUBLE_LITTLE_ENDIAN),
+                         constants.BIG_ENDIAN: struct.Struct(constants.FORMAT_FLOAT_DOUBLE_BIG_ENDIAN)}
+_MAX_NUMBER_OF_CACHED_OVERVIEWS = 256
+_EMPTY_BY_DLC = tuple(constants.NULL_BYTE * i for i in range(constants.MAX_NUMBER_OF_CAN_DATA_BYTES + 1))
+_HEX_TABLE = tuple("{:02X}".format(i) for i in range(256))
+
+try:
+    b''.hex(' ')  # Python 3.8 and later
+    _HAS_HEX_SEPARATOR = True
+except (AttributeError, TypeError):
+    _HAS_HEX_SEPARATOR = False
+
 
 class CanFrame():
     """
@@ -45,6 +67,7 @@ class CanFrame():
       len(myframe.frame_data)
 
     """
+    __slots__ = ('_frame_id', '_frame_data', '_frame_format')
 
     def __init__(self, frame_id, frame_data, frame_format=constants.CAN_FRAMEFORMAT_STANDARD):
         # Properties #
@@ -53,7 +76,10 @@ class CanFrame():
         self.frame_data = frame_data
 
     def __repr__(self):
-        datastring = " ".join(["{:02X}".format(y) for y in self.frame_data]) if self.frame_data else ""
+        if _HAS_HEX_SEPARATOR:
+            datastring = self.frame_data.hex(' ').upper()
+        else:
+            datastring = " ".join([_HEX_TABLE[y] for y in self.frame_data])
         return "CAN frame ID: {0} (0x{0:03X}, {1}) data: {2} ({3} bytes)".format(
             self.frame_id, self.frame_format, datastring, len(self.frame_data))
 
@@ -78,8 +104,7 @@ class CanFrame():
         if (number_of_bytes > constants.MAX_NUMBER_OF_CAN_DATA_BYTES) or (number_of_bytes < 0):
                 raise exceptions.CanException("Wrong number of number_of_bytes given: {!r}".format(number_of_bytes))
 
-        framedata = constants.NULL_BYTE * number_of_bytes
-        return cls(frame_id, framedata, frame_format)
+        return cls(frame_id, _EMPTY_BY_DLC[number_of_bytes], frame_format)
 
     @classmethod
     def from_rawframe(cls, rawframe):
@@ -91,7 +116,7 @@ class CanFrame():
 
         """
         try:
-            first_part, dlc, framedata8bytes = struct.unpack(constants.FORMAT_CAN_RAWFRAME, rawframe)
+            first_part, dlc, framedata8bytes = _RAWFRAME_STRUCT.unpack(rawframe)
         except struct.error as err:
             raise exceptions.CanException("rawframe is illegal. Given: {!r}. Error: {}".format(rawframe, err))
         frame_id = first_part & constants.CAN_MASK_ID_ONLY
@@ -104,6 +129,27 @@ class CanFrame():
 
         return cls(frame_id, framedata, frame_format)
 
+    @classmethod
+    def _from_rawframe_buffer(cls, buffer, offset=0):
+        """
+        Create a :class:`.CanFrame` from a raw frame in a buffer, without validating the values.
+
+        Intended for frames received from the SocketCAN interface, where the kernel has already validated
+        the frame. The frame data is copied, so the buffer can be reused.
+
+        Args:
+          buffer (bytes, bytearray or other buffer): Contains the raw frame (16 bytes) at *offset*.
+          offset (int): Byte position of the raw frame in the buffer.
+
+        """
+        first_part, dlc, framedata8bytes = _RAWFRAME_STRUCT.unpack_from(buffer, offset)
+        frame = cls.__new__(cls)
+        frame._frame_format = constants.CAN_FRAMEFORMAT_EXTENDED \
+            if first_part & constants.CAN_MASK_EXTENDED_FRAME_BIT else constants.CAN_FRAMEFORMAT_STANDARD
+        frame._frame_id = first_part & constants.CAN_MASK_ID_ONLY
+        frame._frame_data = framedata8bytes[:dlc]
+        return frame
+
     @property
     def frame_id(self):
         """
@@ -114,6 +160,10 @@ class CanFrame():
 
     @frame_id.setter
     def frame_id(self, value):
+        # Fast path for the common case, for example from received raw frames
+        if type(value) is int and 0 <= value <= _MAX_FRAME_ID[self._frame_format]:
+            self._frame_id = value
+            return
         utilities.check_frame_id_and_format(value, self.frame_format)
         self._frame_id = value
 
@@ -160,35 +210,8 @@ class CanFrame():
             The extracted signal physical value (numerical).
 
         """
-        if signaldefinition.signaltype == constants.CAN_SIGNALTYPE_DOUBLE:
-            if signaldefinition.endianness == constants.LITTLE_ENDIAN:
-                unpacked_value = struct.unpack(constants.FORMAT_FLOAT_DOUBLE_LITTLE_ENDIAN, self.frame_data)[0]
-            else:
-                unpacked_value = struct.unpack(constants.FORMAT_FLOAT_DOUBLE_BIG_ENDIAN, self.frame_data)[0]
-        else:
-            bus_value = utilities.get_busvalue_from_bytes(self.frame_data,
-                                                          signaldefinition.endianness,
-                                                          signaldefinition.numberofbits,
-                                                          signaldefinition.startbit)
-
-            # Unpack from signal type
-            if signaldefinition.signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
-                unpacked_value = bus_value
-            elif signaldefinition.signaltype == constants.CAN_SIGNALTYPE_SIGNED:
-                unpacked_value = utilities.from_twos_complement(bus_value, signaldefinition.numberofbits)
-            else:  # CAN_SIGNALTYPE_SINGLE:
-                useful_bytes = struct.pack(constants.FORMAT_DATA_4BYTES_INT, bus_value)  # Create 'bytes' of length 4
-                unpacked_value = struct.unpack(constants.FORMAT_FLOAT_SINGLE_BIG_ENDIAN, useful_bytes)[0]
-
-        physical_value = (unpacked_value * signaldefinition.scalingfactor) + signaldefinition.valueoffset
-
-        # Limit to minvalue and maxvalue
-        if signaldefinition.minvalue is not None:
-            physical_value = max(signaldefinition.minvalue, physical_value)
-        if signaldefinition.maxvalue is not None:
-            physical_value = min(signaldefinition.maxvalue, physical_value)
-
-        return physical_value
+        dataint_big, dataint_little = _get_dataints(self.frame_data)
+        return _decode_signalvalue(signaldefinition, self.frame_data, dataint_big, dataint_little)
 
     def set_signalvalue(self, signaldefinition, physical_value=None):
         """
@@ -204,70 +227,65 @@ class CanFrame():
           CanException: For wrong startbit or values. See :exc:`.CanException`.
 
         """
-        if signaldefinition.get_minimum_dlc() > len(self):
+        signaltype, endianness, scalingfactor, valueoffset, minvalue, maxvalue, \
+            minimum_possible_value, maximum_possible_value, minimum_dlc = signaldefinition._get_value_parameters()
+
+        if minimum_dlc > len(self):
             raise exceptions.CanException('The frame is too short to send_frame this signal. Frame: {}, signal: {}'.
                                           format(self, signaldefinition))
         if physical_value is None:
             physical_value = signaldefinition.defaultvalue
 
-        if physical_value < signaldefinition.get_minimum_possible_value() or \
-                physical_value > signaldefinition.get_maximum_possible_value():
+        if physical_value < minimum_possible_value or physical_value > maximum_possible_value:
             raise exceptions.CanException('The physical value is out of range. Value: {}, range {} to {}'.format(
-                                          physical_value,
-                                          signaldefinition.get_minimum_possible_value(),
-                                          signaldefinition.get_maximum_possible_value()))
+                                          physical_value, minimum_possible_value, maximum_possible_value))
 
         # Limit to minvalue and maxvalue
-        if signaldefinition.minvalue is not None:
-            physical_value = max(signaldefinition.minvalue, physical_value)
-        if signaldefinition.maxvalue is not None:
-            physical_value = min(signaldefinition.maxvalue, physical_value)
+        if minvalue is not None:
+            physical_value = max(minvalue, physical_value)
+        if maxvalue is not None:
+            physical_value = min(maxvalue, physical_value)
 
         # Scale according to valueoffset and scalingfactor
-        scaled_value = float((physical_value - signaldefinition.valueoffset) / signaldefinition.scalingfactor)
+        scaled_value = float((physical_value - valueoffset) / scalingfactor)
 
         # Shortcut for double precision floats (occupies full frame)
-        if signaldefinition.signaltype == constants.CAN_SIGNALTYPE_DOUBLE:
-            if signaldefinition.endianness == constants.LITTLE_ENDIAN:
-                self.frame_data = struct.pack(constants.FORMAT_FLOAT_DOUBLE_LITTLE_ENDIAN, scaled_value)
-            else:
-                self.frame_data = struct.pack(constants.FORMAT_FLOAT_DOUBLE_BIG_ENDIAN, scaled_value)
+        if signaltype == constants.CAN_SIGNALTYPE_DOUBLE:
+            self._frame_data = _FLOAT_DOUBLE_STRUCTS[endianness].pack(scaled_value)
             return
 
         # Encode to correct signaltype
-        if signaldefinition.signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
+        if signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
             bus_value = int(scaled_value)
-        elif signaldefinition.signaltype == constants.CAN_SIGNALTYPE_SIGNED:
+        elif signaltype == constants.CAN_SIGNALTYPE_SIGNED:
             bus_value = utilities.twos_complement(int(scaled_value), signaldefinition.numberofbits)
         else:  # CAN_SIGNALTYPE_SINGLE:
-            bus_value = utilities.can_bytes_to_int(
-                struct.pack(constants.FORMAT_FLOAT_SINGLE_BIG_ENDIAN, scaled_value).
-                rjust(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, constants.NULL_BYTE))
+            bus_value = int.from_bytes(_FLOAT_SINGLE_STRUCT.pack(scaled_value), constants.BIG_ENDIAN)
+
+        is_little_endian, shift, mask, _ = signaldefinition._get_bit_layout()
 
         # Limit the size of the field to be written
-        assert bus_value <= (2 ** signaldefinition.numberofbits - 1), "Trying to set too large signal value to frame."
+        assert bus_value <= mask, "Trying to set too large signal value to frame."
         assert bus_value >= 0, "Trying to set too small signal value to the frame."
 
-        bitvalues = utilities.get_shiftedvalue_from_busvalue(bus_value,
-                                                             signaldefinition.endianness,
-                                                             signaldefinition.numberofbits,
-                                                             signaldefinition.startbit)
+        frame_data = self.frame_data
+        dlc = len(frame_data)
 
-        raw_mask = ((1 << signaldefinition.numberofbits) - 1)  # Mask with ones in 'numberofbits' positions
-        mask = utilities.get_shiftedvalue_from_busvalue(raw_mask,
-                                                        signaldefinition.endianness,
-                                                        signaldefinition.numberofbits,
-                                                        signaldefinition.startbit)
-
-        # Parse existing frame_data
-        dataint = utilities.can_bytes_to_int(self.frame_data)
-        dlc = len(self.frame_data)
+        if is_little_endian:
+            byteorder = constants.LITTLE_ENDIAN
+        else:
+            # The shift is given for data padded to 8 bytes. Adjust it for the actual number
+            # of bytes, instead of padding and cutting the data. The DLC check above makes sure it is not negative.
+            byteorder = constants.BIG_ENDIAN
+            shift -= constants.BITS_PER_BYTE * (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - dlc)
 
         # Modify the frame_data by writing zeros to the appropriate field (using bitwise AND),
         # then writing in the relevant data (by using bitwise OR)
-        dataint = (dataint & ~mask) | bitvalues
+        dataint = int.from_bytes(frame_data, byteorder)
+        dataint = (dataint & ~(mask << shift)) | (bus_value << shift)
 
-        self.frame_data = utilities.int_to_can_bytes(dlc, dataint)
+        # The length is unchanged, so the validation in the frame_data setter is not needed
+        self._frame_data = dataint.to_bytes(dlc, byteorder)
 
     def unpack(self, frame_definitions):
         """Unpack the CAN frame, and return all signal values.
@@ -292,22 +310,112 @@ class CanFrame():
         if len(self.frame_data) != fr_def.dlc:
             raise exceptions.CanException('The received frame has wrong length: {}, Def: {}'.format(self, fr_def))
         
+        return fr_def.compile_unpack()(self.frame_data)
+        
+    @staticmethod
+    def unpack_many(frames, frame_definitions):
+        """Unpack a sequence of CAN frames, and return the signal values grouped by signal.
+
+        Args:
+          frames: Iterable of :class:`.CanFrame` objects.
+          frame_definitions (dict): The keys are frame_id (int) and
+            the items are :class:`.CanFrameDefinition` objects.
+
+        Raises:
+          CanException: For wrong DLC. See :exc:`.CanException`.
+
+        Returns:
+          A dictionary of signal value lists. The keys are the signalname (str) and the items are lists
+          of the values (numerical), in the order the frames were given.
+
+        Frames not described in the 'frame_definitions' are ignored.
+        """
         outputdict = {}
-        for sigdef in fr_def.signaldefinitions:
-            val = self.get_signalvalue(sigdef)
-            outputdict[sigdef.signalname] = val
+        unpack_functions = {}  # Keys are frame_id. The definitions do not change during the call.
+        for frame in frames:
+            frame_id = frame.frame_id
+            try:
+                fr_def = frame_definitions[frame_id]
+            except KeyError:
+                continue
+
+            frame_data = frame.frame_data
+            if len(frame_data) != fr_def.dlc:
+                raise exceptions.CanException('The received frame has wrong length: {}, Def: {}'.format(frame, fr_def))
+            try:
+                unpack_function = unpack_functions[frame_id]
+            except KeyError:
+                unpack_function = unpack_functions[frame_id] = fr_def.compile_unpack()
+            _append_signalvalues(outputdict, unpack_function(frame_data))
         return outputdict
-        
+
+    @staticmethod
+    def unpack_rawframes(rawframes, frame_definitions, processes=1):
+        """Unpack raw frames from the SocketCAN interface, and return the signal values grouped by signal.
+
+        This gives the same result as :meth:`.unpack_many`, but without creating any :class:`.CanFrame` objects.
+
+        Args:
+          rawframes (bytes): Several raw frames (16 bytes each) after each other, for example
+            a received buffer or the contents of a log file.
+          frame_definitions (dict): The keys are frame_id (int) and
+            the items are :class:`.CanFrameDefinition` objects.
+          processes (int or None): Number of worker processes to split the decoding between. Defaults to ``1``
+            (decode in this process). Use :const:`None` for one process per CPU. Only worthwhile for large logs,
+            so fewer processes are used if there would be less than ``MIN_NUMBER_OF_FRAMES_PER_PROCESS`` frames
+            per process (see :mod:`.constants`).
+
+        Raises:
+          CanException: For wrong DLC, wrong rawframes length or wrong number of processes.
+          See :exc:`.CanException`.
+
+        Returns:
+          A dictionary of signal value lists. The keys are the signalname (str) and the items are lists
+          of the values (numerical), in the order the frames were given.
+
+        Frames not described in the 'frame_definitions' are ignored.
+        """
+        rawframes = memoryview(rawframes)
+        number_of_rawframes, remainder = divmod(len(rawframes), _RAWFRAME_STRUCT.size)
+        if remainder:
+            raise exceptions.CanException("rawframes has wrong length: {} bytes".format(len(rawframes)))
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if type(processes) is not int or processes < 1:
+            raise exceptions.CanException("processes should be a positive integer or None. Given: {!r}".format(
+                processes))
+        processes = min(processes, number_of_rawframes // constants.MIN_NUMBER_OF_FRAMES_PER_PROCESS)
+        if processes <= 1:
+            return _unpack_rawframes(rawframes, frame_definitions)
+
+        # Split into one chunk per process. The frames are independent, so the results just are concatenated.
+        chunksize = _RAWFRAME_STRUCT.size * -(-number_of_rawframes // processes)  # Rounded up
+        arguments = [(rawframes[offset:offset + chunksize].tobytes(), frame_definitions)
+                     for offset in range(0, len(rawframes), chunksize)]
+        with multiprocessing.Pool(len(arguments)) as pool:
+            partial_results = pool.starmap(_unpack_rawframes, arguments)
+
+        outputdict = {}
+        for partial_result in partial_results:
+            for signalname, values in partial_result.items():
+                try:
+                    outputdict[signalname].extend(values)
+                except KeyError:
+                    outputdict[signalname] = values
+        return outputdict
+
     def get_rawframe(self):
         """Returns a 16 bytes long 'bytes' object."""
-        dlc = len(self.frame_data)
-        framedata8bytes = self.frame_data.ljust(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, constants.NULL_BYTE)
+        frame_data = self._frame_data
 
         # Set flag for extended frame format, if necessary
-        first_part = self.frame_id
-        if self.frame_format == constants.CAN_FRAMEFORMAT_EXTENDED:
+        first_part = self._frame_id
+        if self._frame_format == constants.CAN_FRAMEFORMAT_EXTENDED:
             first_part |= constants.CAN_MASK_EXTENDED_FRAME_BIT
-        return struct.pack(constants.FORMAT_CAN_RAWFRAME, first_part, dlc, framedata8bytes)
+
+        # The struct pads the frame data with null bytes to 8 bytes
+        return _RAWFRAME_STRUCT.pack(first_part, len(frame_data), frame_data)
 
     def get_descriptive_ascii_art(self):
         """Create a visual indication of the frame data
@@ -317,5 +425,250 @@ class CanFrame():
 
         """
         text = "{!r} \n".format(self)
-        text += utilities.generate_can_integer_overview(utilities.can_bytes_to_int(self.frame_data))
+        text += _get_data_overview(self.frame_data)
         return text
+
+
+@functools.lru_cache(maxsize=_MAX_NUMBER_OF_CACHED_OVERVIEWS)
+def _get_data_overview(frame_data):
+    """Create a visual indication of frame data. The result is cached, as the same data often is repeated.
+
+    Args:
+      frame_data (bytes): 0-8 bytes of CAN data
+
+    Returns:
+      A multi-line string.
+
+    """
+    return utilities.generate_can_integer_overview(utilities.can_bytes_to_int(frame_data))
+
+
+def _get_dataints(frame_data):
+    """Interpret frame data as integers.
+
+    Args:
+      frame_data (bytes): 0-8 bytes of CAN data
+
+    Returns the tuple (dataint_big, dataint_little). The first is the data padded to 8 bytes and
+    interpreted as a big endian integer (as in :func:`.can_bytes_to_int`). The second is the data
+    interpreted as a little endian integer, where the bit numbered *n* in the standard bit numbering
+    has the value ``2**n``.
+
+    """
+    if len(frame_data) == constants.MAX_NUMBER_OF_CAN_DATA_BYTES:  # The most common case. Faster than int.from_bytes()
+        return _DATA_BIG_STRUCT.unpack(frame_data)[0], _DATA_LITTLE_STRUCT.unpack(frame_data)[0]
+
+    dataint_big = int.from_bytes(frame_data, constants.BIG_ENDIAN) << \
+        (constants.BITS_PER_BYTE * (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - len(frame_data)))
+    dataint_little = int.from_bytes(frame_data, constants.LITTLE_ENDIAN)
+    return dataint_big, dataint_little
+
+
+def _unpack_rawframes(rawframes, frame_definitions):
+    """Unpack raw frames. See :meth:`.CanFrame.unpack_rawframes`.
+
+    Args:
+      rawframes (bytes or memoryview): Raw frames after each other. The length must be a multiple of 16 bytes.
+      frame_definitions (dict): The keys are frame_id (int) and
+        the items are :class:`.CanFrameDefinition` objects.
+
+    Returns:
+      A dictionary of signal value lists.
+
+    """
+    outputdict = {}
+    unpack_functions = {}  # Keys are frame_id. The definitions do not change during the call.
+    for offset in range(0, len(rawframes), _RAWFRAME_STRUCT.size):
+        first_part, dlc, framedata8bytes = _RAWFRAME_STRUCT.unpack_from(rawframes, offset)
+        frame_id = first_part & constants.CAN_MASK_ID_ONLY
+        try:
+            fr_def = frame_definitions[frame_id]
+        except KeyError:
+            continue
+
+        if dlc != fr_def.dlc:
+            raise exceptions.CanException('The received frame has wrong length: {}, Def: {}'.format(
+                CanFrame.from_rawframe(rawframes[offset:offset + _RAWFRAME_STRUCT.size]), fr_def))
+        try:
+            unpack_function = unpack_functions[frame_id]
+        except KeyError:
+            unpack_function = unpack_functions[frame_id] = fr_def.compile_unpack()
+        _append_signalvalues(outputdict, unpack_function(framedata8bytes[:dlc]))
+    return outputdict
+
+
+def _append_signalvalues(outputdict, signalvalues):
+    """Append signal values to lists in a dictionary.
+
+    Args:
+      outputdict (dict): The keys are the signalname (str) and the items are lists of values. Modified in place.
+      signalvalues (dict): Values from the unpack function of a frame definition, see
+        :meth:`.CanFrameDefinition.compile_unpack`.
+
+    """
+    for signalname, value in signalvalues.items():
+        try:
+            outputdict[signalname].append(value)
+        except KeyError:
+            outputdict[signalname] = [value]
+
+
+def _decode_signalvalue(signaldefinition, frame_data, dataint_big, dataint_little):
+    """Extract a signal physical value from frame data, which already is interpreted as integers.
+
+    Args:
+      signaldefinition (:class:`.CanSignalDefinition` object): The definition of the signal
+      frame_data (bytes): 0-8 bytes of CAN data
+      dataint_big (int): The frame data as a big endian integer. See :func:`._get_dataints`.
+      dataint_little (int): The frame data as a little endian integer. See :func:`._get_dataints`.
+
+    Returns:
+        The extracted signal physical value (numerical).
+
+    """
+    signaltype, endianness, scalingfactor, valueoffset, minvalue, maxvalue, _, _, _ = \
+        signaldefinition._get_value_parameters()
+    if signaltype == constants.CAN_SIGNALTYPE_DOUBLE:
+        unpacked_value = _FLOAT_DOUBLE_STRUCTS[endianness].unpack(frame_data)[0]
+    else:
+        is_little_endian, shift, mask, sign_mask = signaldefinition._get_bit_layout()
+        if is_little_endian:
+            bus_value = (dataint_little >> shift) & mask
+        else:
+            bus_value = (dataint_big >> shift) & mask
+
+        # Unpack from signal type
+        if signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
+            unpacked_value = bus_value
+        elif signaltype == constants.CAN_SIGNALTYPE_SIGNED:
+            unpacked_value = (bus_value ^ sign_mask) - sign_mask  # Inverse of two's complement
+        else:  # CAN_SIGNALTYPE_SINGLE:
+            useful_bytes = bus_value.to_bytes(constants.BYTES_IN_SINGLE_PRECISION_FLOAT, constants.BIG_ENDIAN)
+            unpacked_value = _FLOAT_SINGLE_STRUCT.unpack(useful_bytes)[0]
+
+    physical_value = (unpacked_value * scalingfactor) + valueoffset
+
+    # Limit to minvalue and maxvalue
+    if minvalue is not None:
+        physical_value = max(minvalue, physical_value)
+    if maxvalue is not None:
+        physical_value = min(maxvalue, physical_value)
+
+    return physical_value
+
+
+def _generate_unpack_function(plan):
+    """Generate a function for unpacking frame data, specialized for some signal definitions.
+
+    Args:
+      plan (tuple): Tuple of (signalname, signaldefinition) tuples. See :meth:`.CanFrameDefinition._get_plan`.
+
+    Returns:
+      A function that takes the frame data (bytes) as argument, and returns a dictionary of signal values.
+
+    The generated code does the same calculations as :func:`._decode_signalvalue`, but with the
+    signal properties inserted as constants and without any loop over the signals.
+
+    """
+    namespace = {'_DATA_BIG_STRUCT': _DATA_BIG_STRUCT,
+                 '_DATA_LITTLE_STRUCT': _DATA_LITTLE_STRUCT,
+                 '_FLOAT_SINGLE_STRUCT': _FLOAT_SINGLE_STRUCT,
+                 '_FLOAT_SINGLE_LITTLE_STRUCT': _FLOAT_SINGLE_LITTLE_STRUCT,
+                 '_FLOAT_DOUBLE_STRUCT_LITTLE': _FLOAT_DOUBLE_STRUCTS[constants.LITTLE_ENDIAN],
+                 '_FLOAT_DOUBLE_STRUCT_BIG': _FLOAT_DOUBLE_STRUCTS[constants.BIG_ENDIAN]}
+    endiannesses = set(sigdef.endianness for _, sigdef in plan
+                       if sigdef.signaltype != constants.CAN_SIGNALTYPE_DOUBLE)
+
+    lines = ["def unpack(frame_data):"]
+    if endiannesses:
+        lines.append("    if len(frame_data) == {}:".format(constants.MAX_NUMBER_OF_CAN_DATA_BYTES))
+        if constants.BIG_ENDIAN in endiannesses:
+            lines.append("        dataint_big = _DATA_BIG_STRUCT.unpack(frame_data)[0]")
+        if constants.LITTLE_ENDIAN in endiannesses:
+            lines.append("        dataint_little = _DATA_LITTLE_STRUCT.unpack(frame_data)[0]")
+        lines.append("    else:")
+        if constants.BIG_ENDIAN in endiannesses:
+            lines.append("        dataint_big = int.from_bytes(frame_data, 'big') << ({} * ({} - len(frame_data)))"
+                         .format(constants.BITS_PER_BYTE, constants.MAX_NUMBER_OF_CAN_DATA_BYTES))
+        if constants.LITTLE_ENDIAN in endiannesses:
+            lines.append("        dataint_little = int.from_bytes(frame_data, 'little')")
+    lines.append("    outputdict = {}")
+
+    for signalname, sigdef in plan:
+        if sigdef.signaltype == constants.CAN_SIGNALTYPE_DOUBLE:
+            lines.append("    value = _FLOAT_DOUBLE_STRUCT_{}.unpack(frame_data)[0]".format(sigdef.endianness.upper()))
+        else:
+            is_little_endian, shift, mask, sign_mask = sigdef._get_bit_layout()
+            extraction = "value = (dataint_{} >> {}) & {}".format('little' if is_little_endian else 'big', shift, mask)
+            if sigdef.signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
+                lines.append("    " + extraction)
+            elif sigdef.signaltype == constants.CAN_SIGNALTYPE_SIGNED:
+                lines.append("    " + extraction)
+                lines.append("    value = (value ^ {0}) - {0}".format(sign_mask))
+            else:  # CAN_SIGNALTYPE_SINGLE
+                conversion = "value = _FLOAT_SINGLE_STRUCT.unpack(value.to_bytes({}, 'big'))[0]".format(
+                    constants.BYTES_IN_SINGLE_PRECISION_FLOAT)
+                byte_offset = _get_byte_offset_of_aligned_float(is_little_endian, shift)
+                if byte_offset is None:
+                    lines.append("    " + extraction)
+                    lines.append("    " + conversion)
+                else:
+                    # Interpret the bytes directly as a float, if they are available in the frame data
+                    lines.append("    if len(frame_data) >= {}:".format(
+                        byte_offset + constants.BYTES_IN_SINGLE_PRECISION_FLOAT))
+                    lines.append("        value = _FLOAT_SINGLE_{}STRUCT.unpack_from(frame_data, {})[0]".format(
+                        'LITTLE_' if is_little_endian else '', byte_offset))
+                    lines.append("    else:")
+                    lines.append("        " + extraction)
+                    lines.append("        " + conversion)
+
+        scalingfactor = _as_source_constant(sigdef.scalingfactor, namespace)
+        valueoffset = _as_source_constant(sigdef.valueoffset, namespace)
+        lines.append("    value = (value * {}) + {}".format(scalingfactor, valueoffset))
+        if sigdef.minvalue is not None:
+            lines.append("    value = max({}, value)".format(_as_source_constant(sigdef.minvalue, namespace)))
+        if sigdef.maxvalue is not None:
+            lines.append("    value = min({}, value)".format(_as_source_constant(sigdef.maxvalue, namespace)))
+        lines.append("    outputdict[{!r}] = value".format(signalname))
+
+    lines.append("    return outputdict")
+    exec(compile("\n".join(lines), "<can4python generated unpack function>", "exec"), namespace)
+    return namespace['unpack']
+
+
+def _get_byte_offset_of_aligned_float(is_little_endian, shift):
+    """Find the position of a single precision float signal that is aligned to whole bytes.
+
+    Args:
+      is_little_endian (bool): True for little endian signals
+      shift (int): Shift from the bit layout, see :meth:`.CanSignalDefinition._get_bit_layout`.
+
+    Returns the byte number (int) of the first byte of the signal in the frame data, or :const:`None` if the signal
+    not is aligned to whole bytes.
+
+    """
+    if shift % constants.BITS_PER_BYTE:
+        return None
+    if is_little_endian:
+        byte_offset = shift // constants.BITS_PER_BYTE
+    else:
+        byte_offset = constants.MAX_NUMBER_OF_CAN_DATA_BYTES - constants.BYTES_IN_SINGLE_PRECISION_FLOAT - \
+            shift // constants.BITS_PER_BYTE
+    if byte_offset < 0 or \
+            byte_offset + constants.BYTES_IN_SINGLE_PRECISION_FLOAT > constants.MAX_NUMBER_OF_CAN_DATA_BYTES:
+        return None
+    return byte_offset
+
+
+def _as_source_constant(value, namespace):
+    """Get a source code representation of a value, for use in generated code.
+
+    Integers and finite floats are written as literals. Other values are stored in the *namespace*
+    dictionary (modified in place), and the returned string is the name of the value there.
+
+    """
+    if type(value) is int or (type(value) is float and math.isfinite(value)):
+        return repr(value)
+    name = "_constant{}".format(len(namespace))
+    namespace[name] = value
+    return name
@@ -25,9 +25,17 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # 
 
+import struct
+
 from . import constants
 from . import exceptions
 from . import utilities
+from . import canframe
+
+_SIGNAL_MASK_STRUCT = struct.Struct(constants.FORMAT_DATA_LONGLONG)
+_MAX_FRAME_ID = {constants.CAN_FRAMEFORMAT_STANDARD: constants.MAX_CAN_FRAME_ID_STANDARD,
+                 constants.CAN_FRAMEFORMAT_EXTENDED: constants.MAX_CAN_FRAME_ID_EXTENDED}
+_CACHE_ATTRIBUTES = ('_plan', '_unpacker', '_signal_mask', '_signal_ascii_art', '_plan_signaldefinitions')
 
 
 class CanFrameDefinition():
@@ -42,12 +50,17 @@ class CanFrameDefinition():
 
     Attributes:
       name (str): Frame name
-      signaldefinitions (list of CanSignalDefinition objects): Defaults to an empty list.
-        See :class:`.CanSignalDefinition`.
       receive_on_change_only (bool): Receive this frame only for updated data value
         (a data bitmask will be calculated). Defaults to False.
 
     """
+    # Caches, see _get_plan()
+    _plan = None
+    _unpacker = None
+    _signal_mask = None
+    _signal_ascii_art = None
+    _plan_signaldefinitions = None
+
     def __init__(self, frame_id, name='', dlc=constants.MAX_NUMBER_OF_CAN_DATA_BYTES, cycletime=None,
                  frame_format=constants.CAN_FRAMEFORMAT_STANDARD):
         # Properties
@@ -58,9 +71,10 @@ class CanFrameDefinition():
         self.throttle_time = None
         self.producer_ids = []
 
+        self.signaldefinitions = []
+
         # Plain attributes
         self.name = str(name)
-        self.signaldefinitions = []
         self.receive_on_change_only = False
 
 
@@ -89,6 +103,9 @@ class CanFrameDefinition():
 
     @frame_id.setter
     def frame_id(self, value):
+        if type(value) is int and 0 <= value <= _MAX_FRAME_ID[self._format]:
+            self._id = value
+            return
         utilities.check_frame_id_and_format(value, self.frame_format)
         self._id = value
 
@@ -160,6 +177,21 @@ class CanFrameDefinition():
             raise exceptions.CanException("Wrong frame_format. Given: {!r}".format(value))
         self._format = value
 
+    @property
+    def signaldefinitions(self):
+        """
+        *list of CanSignalDefinition objects* Defaults to an empty list. See :class:`.CanSignalDefinition`.
+        You can pass it any iterable (it will convert to a list).
+        """
+        return self._signaldefinitions
+
+    @signaldefinitions.setter
+    def signaldefinitions(self, value):
+        try:
+            self._signaldefinitions = list(value)
+        except TypeError:
+            raise exceptions.CanException("signaldefinitions should be a list. Given: {!r}".format(value))
+
     @property
     def producer_ids(self):
         """
@@ -188,9 +220,10 @@ class CanFrameDefinition():
         text = self.__repr__(long_text=False) + "\n"
         text += "    Signal details:\n"
         text += "    ---------------\n"
-        for signal in self.signaldefinitions:
-            text += "\n\n" + signal.get_descriptive_ascii_art()
-        return text
+        plan = self._get_plan()  # Checks for modifications
+        if self._signal_ascii_art is None:
+            self._signal_ascii_art = "".join(["\n\n" + signaldef.get_descriptive_ascii_art() for _, signaldef in plan])
+        return text + self._signal_ascii_art
 
     def get_signal_mask(self):
         """Calculate signal mask.
@@ -199,18 +232,21 @@ class CanFrameDefinition():
         is an interesting signal.
 
         """
-        output_int = 0
-        for signaldef in self.signaldefinitions:
-
-            # Generate a 64 character string describing the signal
-            overviewstring, _ = signaldef._get_overview_string()
-
-            # Look for non-empty positions in the string
-            for pos, char in enumerate(overviewstring):
-                if char != " ":
-                    output_int |= 2 ** (constants.BITS_IN_FULL_DATA - 1 - pos)
-
-        return utilities.int_to_can_bytes(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, output_int)
+        plan = self._get_plan()  # Checks for modifications
+        if self._signal_mask is None:
+            # Collect the little endian and big endian signals separately, and combine them once
+            mask_big = 0
+            mask_little = 0
+            for _, signaldef in plan:
+                is_little_endian, shift, mask, _ = signaldef._get_bit_layout()
+                if is_little_endian:
+                    mask_little |= mask << shift
+                else:
+                    mask_big |= mask << shift
+            mask_little_bytes = mask_little.to_bytes(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, constants.LITTLE_ENDIAN)
+            self._signal_mask = _SIGNAL_MASK_STRUCT.pack(mask_big | int.from_bytes(mask_little_bytes,
+                                                                                   constants.BIG_ENDIAN))
+        return self._signal_mask
 
     def is_outbound(self, ego_node_ids):
         """
@@ -228,7 +264,53 @@ class CanFrameDefinition():
         if not self.producer_ids or not ego_node_ids:
             return False
         try:
-            ego_node_ids = set(ego_node_ids)
+            return not self.producer_ids.isdisjoint(ego_node_ids)
         except TypeError:
             raise exceptions.CanException("Wrong ego_node_ids. Should be iterable. Given: {!r}".format(ego_node_ids))
-        return bool(ego_node_ids & self.producer_ids)
+
+    def compile_unpack(self):
+        """Get a function for unpacking the data of frames with this definition.
+
+        The function is generated (and compiled) from the signal definitions the first time,
+        and is then reused until the signal definitions are modified. It is used by :meth:`.CanFrame.unpack`.
+
+        Returns:
+          A function that takes the frame data (bytes object of length :attr:`dlc`) as argument, and returns
+          a dictionary of signal values. The keys are the signalname (str) and the items are the values (numerical).
+
+        """
+        plan = self._get_plan()  # Checks for modifications
+        if self._unpacker is None:
+            self._unpacker = canframe._generate_unpack_function(plan)
+        return self._unpacker
+
+    def _get_plan(self):
+        """Get the signals to use when unpacking frames.
+
+        Returns a tuple of (signalname, signaldefinition) tuples. It is calculated once, and recalculated
+        only after :attr:`signaldefinitions` or any :class:`.CanSignalDefinition` has been modified.
+
+        """
+        # A modified signal invalidates the plan of its owners. Changes to the list itself are found by comparing
+        # to a copy, which is done in C (CanSignalDefinition objects compare by identity).
+        if self._plan is None or self._signaldefinitions != self._plan_signaldefinitions:
+            self._invalidate_plan()
+            self._plan_signaldefinitions = list(self._signaldefinitions)
+            for signaldef in self._plan_signaldefinitions:
+                signaldef._owners.add(self)
+            self._plan = tuple((signaldef.signalname, signaldef) for signaldef in self._plan_signaldefinitions)
+        return self._plan
+
+    def _invalidate_plan(self):
+        """Force recalculation of the plan and the unpack function, see :meth:`._get_plan`."""
+        self._plan = None
+        self._unpacker = None
+        self._signal_mask = None
+        self._signal_ascii_art = None
+
+    def __getstate__(self):
+        """Leave out the cached plan and unpack function when pickling (the generated function can not be pickled)."""
+        state = self.__dict__.copy()
+        for name in _CACHE_ATTRIBUTES:
+            state.pop(name, None)
+        return state
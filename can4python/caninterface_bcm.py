@@ -26,6 +26,7 @@
 # 
 
 import errno
+import select
 import socket
 import struct
 import sys
@@ -35,6 +36,8 @@ from . import constants
 from . import exceptions
 from . import utilities
 
+_TIMESPEC_STRUCT = struct.Struct(constants.FORMAT_TIMESPEC)
+
 
 class SocketCanBcmInterface():
     """
@@ -55,6 +58,7 @@ class SocketCanBcmInterface():
         assert sys.version_info >= (3, 4, 0), "Python version 3.4 or later required for using SocketCAN BCM!"
 
         self._interfacename = str(interfacename)
+        self._timestamps_enabled = False
         self._socket = socket.socket(socket.PF_CAN, socket.SOCK_DGRAM, socket.CAN_BCM)
         try:
             self._socket.settimeout(timeout)
@@ -79,15 +83,87 @@ class SocketCanBcmInterface():
         """Close the socket"""
         self._socket.close()
     
+    def flush_receive_queue(self):
+        """Discard all frames waiting in the receive queue (in the Linux kernel).
+
+        Returns the number of discarded BCM messages.
+
+        """
+        number_of_discarded = 0
+        while select.select([self._socket], [], [], 0)[0]:
+            self._socket.recv(constants.MAX_NUMBER_OF_BYTES_FROM_BCM)
+            number_of_discarded += 1
+        return number_of_discarded
+
     def recv_next_frame(self):
         """Receive one CAN frame.
 
         Returns a :class:`.CanFrame` object.
 
         """
-                # Receive BCM message
+        raw_message, _ = self._recv_via_socket()
+        return self._extract_frame(raw_message)
+
+    def recv_next_frame_with_timestamp(self):
+        """Receive one CAN frame, together with the time when the Linux kernel received it.
+
+        Returns the tuple (frame, timestamp), where frame is a :class:`.CanFrame` object and timestamp
+        is the time in seconds since the epoch (float).
+
+        The kernel timestamps are more accurate than measuring the time after receiving the frame in Python,
+        and are useful for example when studying the frame intervals.
+
+        """
+        if not self._timestamps_enabled:
+            try:
+                self._socket.setsockopt(socket.SOL_SOCKET, constants.SO_TIMESTAMPNS, 1)
+            except OSError:
+                raise exceptions.CanException("Could not enable timestamps for CAN interface {}".format(
+                                              self._interfacename))
+            self._timestamps_enabled = True
+
+        raw_message, ancillary_data = self._recv_via_socket(socket.CMSG_SPACE(_TIMESPEC_STRUCT.size))
+        for level, message_type, data in ancillary_data:
+            if level == socket.SOL_SOCKET and message_type == constants.SCM_TIMESTAMPNS:
+                seconds, nanoseconds = _TIMESPEC_STRUCT.unpack(data[:_TIMESPEC_STRUCT.size])
+                return self._extract_frame(raw_message), seconds + nanoseconds / constants.NANOSECONDS_PER_SECOND
+        raise exceptions.CanException("No timestamp received from CAN interface {}".format(self._interfacename))
+
+    def recv_frames_until_idle(self, max_number_of_frames, idle_time):
+        """Receive CAN frames until no frame has been received for some time.
+
+        Args:
+          max_number_of_frames (int): Stop receiving after this number of frames.
+          idle_time (float): Stop receiving when no frame has arrived within this time (in seconds).
+
+        Returns a list of :class:`.CanFrame` objects, possibly empty. Does not raise CanTimeoutException.
+
+        """
+        frames = []
+        while len(frames) < max_number_of_frames:
+            try:
+                readable, _, _ = select.select([self._socket], [], [], idle_time)
+            except (OSError, ValueError):
+                raise exceptions.CanException("The BCM socket seems to be closed. CAN interface: {}".format(
+                                              self._interfacename))
+            if not readable:
+                break
+            raw_message, _ = self._recv_via_socket()
+            frames.append(self._extract_frame(raw_message))
+        return frames
+
+    def _recv_via_socket(self, ancillary_size=0):
+        """Receive a BCM message on the object's socket. Handles OSError.
+
+        Args:
+          ancillary_size (int): Buffer size for ancillary data
+
+        Returns the tuple (raw_message, ancillary_data). See :meth:`socket.socket.recvmsg`.
+
+        """
         try:
-            raw_message, address = self._socket.recvfrom(constants.MAX_NUMBER_OF_BYTES_FROM_BCM)
+            raw_message, ancillary_data, _, _ = self._socket.recvmsg(constants.MAX_NUMBER_OF_BYTES_FROM_BCM,
+                                                                     ancillary_size)
         except socket.timeout:
             raise exceptions.CanTimeoutException("Timeout when reading BCM message from CAN interface {}".format(
                                                  self._interfacename))
@@ -99,6 +175,10 @@ class SocketCanBcmInterface():
                 raise exceptions.CanException("The CAN interface {} seems to be down.".format(
                                               self._interfacename))
             raise
+        return raw_message, ancillary_data
+
+    def _extract_frame(self, raw_message):
+        """Parse a received BCM message, and return the CAN frame as a :class:`.CanFrame` object."""
 
                 # Parse BCM header
         try:
@@ -133,7 +213,16 @@ class SocketCanBcmInterface():
                                        number_of_bcm_frames=1)
         except AttributeError:
             raise exceptions.CanException("The input_frame is wrong: {!r}".format(input_frame))
-        self._send_via_socket(header + input_frame.get_rawframe())
+        self._send_via_socket(header, input_frame.get_rawframe())
+
+    def send_frames(self, input_frames):
+        """Send several CAN frames (:class:`.CanFrame` objects), in the given order.
+
+        The BCM accepts a single frame per TX_SEND message, so one message is sent per frame.
+
+        """
+        for frame in input_frames:
+            self.send_frame(frame)
 
     def setup_periodic_send(self, input_frame, interval=None, restart_timer=True):
         """Setup periodic transmission for a frame ID.
@@ -172,7 +261,7 @@ class SocketCanBcmInterface():
                                        number_of_bcm_frames=1)
         except AttributeError:
             raise exceptions.CanException("The input_frame is wrong: {!r}".format(input_frame))
-        self._send_via_socket(header + input_frame.get_rawframe())
+        self._send_via_socket(header, input_frame.get_rawframe())
 
     def stop_periodic_send(self, frame_id, frame_format=constants.CAN_FRAMEFORMAT_STANDARD):
         """Stop the periodic transmission for this frame_id.
@@ -206,6 +295,9 @@ class SocketCanBcmInterface():
               the corresponding bits to 1 to detect data change in that location. Defaults to None (data is not studied
               for changes, all incoming frames are given to the user).
 
+        The data change detection is done by the BCM in the Linux kernel, so frames with unchanged
+        data are discarded without any processing in Python.
+
         """
         utilities.check_frame_id_and_format(frame_id, frame_format)
 
@@ -235,7 +327,7 @@ class SocketCanBcmInterface():
                                    frame_id=frame_id,
                                    frame_format=frame_format,
                                    number_of_bcm_frames=1)
-        self._send_via_socket(header + masking_frame.get_rawframe())
+        self._send_via_socket(header, masking_frame.get_rawframe())
 
     def stop_reception(self, frame_id, frame_format=constants.CAN_FRAMEFORMAT_STANDARD):
         """Disable the reception for this frame_id.
@@ -254,15 +346,18 @@ class SocketCanBcmInterface():
                                    number_of_bcm_frames=0)
         self._send_via_socket(header)
 
-    def _send_via_socket(self, input_bytes):
-        """Send data on the object's socket. Handles OSError.
+    def _send_via_socket(self, *input_buffers):
+        """Send a BCM message on the object's socket. Handles OSError.
+
+        The parts of the message (typically a BCM header and a raw frame) are sent using scatter-gather I/O
+        in a single system call, without first joining them.
 
         Args:
-          input_bytes (byte): Data to send
+          input_buffers (bytes): Data to send
 
         """
         try:
-            self._socket.send(input_bytes)
+            self._socket.sendmsg(input_buffers)
         except OSError as e:
             if e.errno == errno.EBADF:  # 9 on Linux
                 template = "Could not send CAN BCM message on interface {}. The BCM socket seems to be closed."
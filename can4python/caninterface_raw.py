@@ -25,8 +25,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # 
 
+import ctypes
+import ctypes.util
 import errno
 import logging
+import os
+import select
 import socket
 import struct
 
@@ -34,6 +38,67 @@ from . import canframe
 from . import constants
 from . import exceptions
 
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+except OSError:
+    _libc = None
+_sendmmsg = getattr(_libc, "sendmmsg", None)  # None if not glibc, or too old glibc
+_recvmmsg = getattr(_libc, "recvmmsg", None)
+
+
+class _Iovec(ctypes.Structure):
+    """The struct iovec in the Linux system call interface."""
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class _Msghdr(ctypes.Structure):
+    """The struct msghdr in the Linux system call interface."""
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.c_void_p),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+
+class _Mmsghdr(ctypes.Structure):
+    """The struct mmsghdr in the Linux system call interface, used by sendmmsg() and recvmmsg()."""
+    _fields_ = [("msg_hdr", _Msghdr),
+                ("msg_len", ctypes.c_uint)]
+
+
+if _sendmmsg is not None:
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_Mmsghdr), ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+if _recvmmsg is not None:
+    _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_Mmsghdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    _recvmmsg.restype = ctypes.c_int
+
+
+def _create_message_vector(buffer, number_of_messages):
+    """Create a vector of struct mmsghdr, for sendmmsg() and recvmmsg().
+
+    Args:
+      buffer (ctypes buffer): Memory for the raw frames, at least 16 bytes per message. Must be kept alive
+        as long as the returned vector is in use.
+      number_of_messages (int): Number of messages (raw frames)
+
+    Returns the tuple (messages, iovecs). Both must be kept alive while using the messages.
+
+    """
+    iovecs = (_Iovec * number_of_messages)()
+    messages = (_Mmsghdr * number_of_messages)()
+    buffer_address = ctypes.addressof(buffer)
+    iovecs_address = ctypes.addressof(iovecs)
+    for i in range(number_of_messages):
+        iovecs[i].iov_base = buffer_address + i * constants.SIZE_CAN_RAWFRAME
+        iovecs[i].iov_len = constants.SIZE_CAN_RAWFRAME
+        messages[i].msg_hdr.msg_iov = iovecs_address + i * ctypes.sizeof(_Iovec)
+        messages[i].msg_hdr.msg_iovlen = 1
+    return messages, iovecs
+
 
 class SocketCanRawInterface():
     """
@@ -43,6 +108,9 @@ class SocketCanRawInterface():
       interfacename (str): For example 'vcan0' or 'can1'
       timeout (numerical): Timeout value in seconds for :meth:`.recv_next_signals()`. Defaults
         to None (blocking recv_next_signals).
+      busy_poll_us (int): Busy poll time in microseconds for receiving, using the socket option SO_BUSY_POLL.
+        Reduces the wake-up latency on interfaces supporting busy polling, at the cost of CPU usage.
+        Defaults to None (no busy polling). Increasing the value might require root permissions.
 
     Raises:
       CanException: For interface problems. See :exc:`.CanException`.
@@ -50,9 +118,12 @@ class SocketCanRawInterface():
 
     """
 
-    def __init__(self, interfacename, timeout=None):
+    def __init__(self, interfacename, timeout=None, busy_poll_us=None):
         self._interfacename = str(interfacename)
+        self._receive_vector = None  # Reused between calls to recv_next_frames()
+        self._rawframe_buffer = bytearray(constants.SIZE_CAN_RAWFRAME)  # Reused between calls to recv_next_frame()
         self._socket = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+        self._epoll = None  # Created by drain_frames() when first used
 
         try:
             self._socket.settimeout(timeout)
@@ -65,6 +136,14 @@ class SocketCanRawInterface():
             raise exceptions.CanException("Wrong timeout value for CAN interface {}: {!r}".format(
                                           self._interfacename, timeout))
 
+        if busy_poll_us is not None:
+            try:
+                self._socket.setsockopt(socket.SOL_SOCKET, constants.SO_BUSY_POLL, busy_poll_us)
+            except (OSError, ValueError, TypeError, OverflowError):
+                self.close()
+                raise exceptions.CanException("Could not set busy poll value for CAN interface {}: {!r}".format(
+                                              self._interfacename, busy_poll_us))
+
     def __repr__(self):
         return "SocketCan raw interface: {}".format(self._interfacename)
 
@@ -75,13 +154,26 @@ class SocketCanRawInterface():
 
     def close(self):
         """Close the socket"""
+        if self._epoll is not None:
+            self._epoll.close()
         self._socket.close()
     
+    def flush_receive_queue(self):
+        """Discard all frames waiting in the receive queue (in the Linux kernel).
+
+        Returns the number of discarded frames.
+
+        """
+        number_of_discarded = 0
+        while select.select([self._socket], [], [], 0)[0]:
+            self._socket.recv(constants.SIZE_CAN_RAWFRAME)
+            number_of_discarded += 1
+        return number_of_discarded
+
     def recv_next_frame(self):
         """Receive one CAN frame. Returns a :class:`.CanFrame` object."""
         try:
-            rawframe, address = self._socket.recvfrom(constants.SIZE_CAN_RAWFRAME)
-            return canframe.CanFrame.from_rawframe(rawframe)
+            number_of_bytes = self._socket.recv_into(self._rawframe_buffer, constants.SIZE_CAN_RAWFRAME)
         except socket.timeout:
             raise exceptions.CanTimeoutException("Timeout when reading from CAN interface {}".format(
                                           self._interfacename))
@@ -93,14 +185,200 @@ class SocketCanRawInterface():
                 raise exceptions.CanException("The CAN interface {} seems to be down.".format(
                                           self._interfacename))
             raise
+        if number_of_bytes != constants.SIZE_CAN_RAWFRAME:
+            raise exceptions.CanException("Received a raw frame of wrong size ({} bytes) on CAN interface {}".format(
+                                          number_of_bytes, self._interfacename))
+        return canframe.CanFrame._from_rawframe_buffer(self._rawframe_buffer)
         
+    def recv_next_frames(self, max_number_of_frames=constants.DEFAULT_NUMBER_OF_FRAMES_PER_RECEIVE):
+        """Receive one or more CAN frames, using a single system call.
+
+        Waits (respecting the timeout) until at least one frame is available, and then returns the frames
+        already waiting in the receive queue (in the Linux kernel), up to *max_number_of_frames*.
+
+        Args:
+          max_number_of_frames (int): Largest number of frames to return. Positive. Values above
+            1024 (the largest number of messages per system call) are reduced to 1024.
+
+        Raises:
+          CanException: For wrong max_number_of_frames. See :exc:`.CanException`.
+
+        Returns a list of :class:`.CanFrame` objects, in the order they were received.
+
+        Uses the recvmmsg() system call. Falls back to :meth:`.recv_next_frame` (returning a single frame)
+        if recvmmsg() is not available in the C library.
+
+        """
+        if type(max_number_of_frames) is not int or max_number_of_frames < 1:
+            raise exceptions.CanException("max_number_of_frames should be a positive integer. Given: {!r}".format(
+                                          max_number_of_frames))
+        if _recvmmsg is None:
+            return [self.recv_next_frame()]
+
+        max_number_of_frames = min(max_number_of_frames, constants.MAX_NUMBER_OF_MESSAGES_PER_SYSCALL)
+        while True:
+            timeout = self._socket.gettimeout()
+            if timeout is not None:  # The socket is non-blocking, so wait here
+                self._check_open()
+                readable, _, _ = select.select([self._socket], [], [], timeout)
+                if not readable:
+                    raise exceptions.CanTimeoutException("Timeout when reading from CAN interface {}".format(
+                                                         self._interfacename))
+            frames = self._receive_messages(max_number_of_frames, constants.MSG_WAITFORONE)
+            if frames:
+                return frames
+
+    def drain_frames(self):
+        """Iterate over received CAN frames, as a generator of :class:`.CanFrame` objects.
+
+        Waits for the socket to become readable using epoll (edge triggered), and then reads all frames
+        waiting in the receive queue (in the Linux kernel) before waiting again. This gives one wait
+        per burst of frames, instead of one per frame.
+
+        Raises CanTimeoutException if no frame is received within the timeout.
+
+        """
+        self._check_open()
+        if self._epoll is None:
+            self._epoll = select.epoll()
+            self._epoll.register(self._socket.fileno(), select.EPOLLIN | select.EPOLLET)
+        timeout = self._socket.gettimeout()
+        poll_timeout = -1 if timeout is None else timeout
+        while True:
+            frames = self._recv_available_frames()
+            if frames:
+                for frame in frames:
+                    yield frame
+                continue
+            self._check_open()
+            try:
+                events = self._epoll.poll(poll_timeout)
+            except InterruptedError:
+                continue
+            if not events:
+                raise exceptions.CanTimeoutException("Timeout when reading from CAN interface {}".format(
+                                                     self._interfacename))
+
+    def _check_open(self):
+        if self._socket.fileno() < 0:
+            raise exceptions.CanException("The CAN socket seems to be closed. CAN interface: {}".format(
+                                          self._interfacename))
+
+    def _recv_available_frames(self):
+        """Receive all frames waiting in the receive queue, without blocking.
+
+        Returns a list of :class:`.CanFrame` objects (empty if no frames are waiting).
+
+        """
+        frames = []
+        if _recvmmsg is None:
+            while True:
+                try:
+                    self._socket.recv_into(self._rawframe_buffer, constants.SIZE_CAN_RAWFRAME, socket.MSG_DONTWAIT)
+                except (BlockingIOError, InterruptedError):
+                    return frames
+                except OSError as e:
+                    self._raise_receive_error(e.errno)
+                frames.append(canframe.CanFrame._from_rawframe_buffer(self._rawframe_buffer))
+
+        while True:
+            received_frames = self._receive_messages(constants.MAX_NUMBER_OF_MESSAGES_PER_SYSCALL, socket.MSG_DONTWAIT)
+            if not received_frames:
+                return frames
+            frames.extend(received_frames)
+
+    def _receive_messages(self, max_number_of_frames, flags):
+        """Receive frames using a single recvmmsg() call.
+
+        Returns a list of :class:`.CanFrame` objects. It is empty if no frames were available
+        (non-blocking socket or flags) or if the call was interrupted by a signal.
+
+        """
+        if self._receive_vector is None or self._receive_vector[0] < max_number_of_frames:
+            buffer = ctypes.create_string_buffer(max_number_of_frames * constants.SIZE_CAN_RAWFRAME)
+            messages, iovecs = _create_message_vector(buffer, max_number_of_frames)
+            self._receive_vector = (max_number_of_frames, buffer, messages, iovecs)
+        _, buffer, messages, _ = self._receive_vector
+
+        self._check_open()
+        result = _recvmmsg(self._socket.fileno(), messages, max_number_of_frames, flags, None)
+        if result < 0:
+            error_number = ctypes.get_errno()
+            if error_number in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            self._raise_receive_error(error_number)
+
+        for i in range(result):
+            if messages[i].msg_len != constants.SIZE_CAN_RAWFRAME:
+                raise exceptions.CanException(
+                    "Received a raw frame of wrong size ({} bytes) on CAN interface {}".format(
+                        messages[i].msg_len, self._interfacename))
+
+        from_rawframe_buffer = canframe.CanFrame._from_rawframe_buffer
+        return [from_rawframe_buffer(buffer, offset)
+                for offset in range(0, result * constants.SIZE_CAN_RAWFRAME, constants.SIZE_CAN_RAWFRAME)]
+
+    def _raise_receive_error(self, error_number):
+        if error_number == errno.EBADF:
+            raise exceptions.CanException("The CAN socket seems to be closed. CAN interface: {}".format(
+                                          self._interfacename))
+        elif error_number == errno.ENETDOWN:
+            raise exceptions.CanException("The CAN interface {} seems to be down.".format(
+                                          self._interfacename))
+        raise exceptions.CanException("Could not receive CAN frames on interface {}. Error: {}".format(
+                                      self._interfacename, os.strerror(error_number)))
+
     def send_frame(self, input_frame):
         """Send a can frame (a :class:`.CanFrame` object)"""
         try:
             self._socket.send(input_frame.get_rawframe())
         except OSError:
             raise exceptions.CanException("Could not send_frame CAN frame on interface {}".format(self._interfacename))
+
+    def send_frames(self, input_frames):
+        """Send several CAN frames (:class:`.CanFrame` objects), in the given order.
+
+        The frames are handed to the kernel using the sendmmsg() system call, with up to
+        :data:`.MAX_NUMBER_OF_MESSAGES_PER_SYSCALL` frames per call. Falls back to one send per frame
+        if sendmmsg() is not available in the C library.
+
+        """
+        if _sendmmsg is None:
+            for frame in input_frames:
+                self.send_frame(frame)
+            return
+
+        rawframes = [frame.get_rawframe() for frame in input_frames]
+        number_of_frames = len(rawframes)
+        buffer = ctypes.create_string_buffer(b"".join(rawframes), number_of_frames * constants.SIZE_CAN_RAWFRAME)
+        messages, iovecs = _create_message_vector(buffer, number_of_frames)
+
+        number_of_sent_frames = 0
+        while number_of_sent_frames < number_of_frames:
+            result = _sendmmsg(self._socket.fileno(),
+                               ctypes.byref(messages[number_of_sent_frames]),
+                               min(number_of_frames - number_of_sent_frames,
+                                   constants.MAX_NUMBER_OF_MESSAGES_PER_SYSCALL),
+                               0)
+            if result >= 0:
+                number_of_sent_frames += result
+                continue
+
+            error_number = ctypes.get_errno()
+            if error_number in (errno.EAGAIN, errno.EWOULDBLOCK):  # Non-blocking socket (a timeout is set)
+                _, writable, _ = select.select([], [self._socket], [], self._socket.gettimeout())
+                if writable:
+                    continue
+            elif error_number == errno.EINTR:
+                continue
+            raise exceptions.CanException("Could not send CAN frames on interface {}. Sent {} of {} frames.".format(
+                self._interfacename, number_of_sent_frames, number_of_frames))
                 
+    def clear_receive_filters(self):
+        """Remove the receive filters of the CAN interface, so all frames are received (the kernel default)."""
+        receive_all_filter = struct.pack("=2I", 0, 0)  # Frame ID 0 with an all-zeros mask matches any frame ID
+        self._socket.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER, receive_all_filter)
+
     def set_receive_filters(self, framenumbers):
         """Set the receive filters of the CAN interface (in the Linux kernel).
         
@@ -25,6 +25,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # 
 
+import weakref
+
 from . import constants
 from . import utilities
 from . import exceptions
@@ -98,10 +100,17 @@ class CanSignalDefinition():
         * Startbit is sometimes given as the most significant bit.
 
     """
+    __slots__ = ('_endianness', '_signaltype', '_scalingfactor', '_valueoffset', '_startbit', '_defaultvalue',
+                 '_minvalue', '_maxvalue', '_numberofbits', 'signalname', 'unit', 'comment',
+                 '_bit_layout', '_value_parameters', '_owners')
+
     def __init__(self, signalname, startbit, numberofbits, scalingfactor=1, valueoffset=0, defaultvalue=None,
                  unit="", comment="", minvalue=None, maxvalue=None,
                  endianness=constants.LITTLE_ENDIAN, signaltype=constants.CAN_SIGNALTYPE_UNSIGNED):
 
+        # Frame definitions with cached unpacking plans using this signal, see CanFrameDefinition._get_plan()
+        self._owners = weakref.WeakSet()
+
         # Properties #
         self.endianness = endianness
         self.signaltype = signaltype
@@ -121,6 +130,24 @@ class CanSignalDefinition():
         self.unit = str(unit)
         self.comment = str(comment)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            # Invalidate cached values, also in the frame definitions using this signal
+            super().__setattr__('_bit_layout', None)
+            super().__setattr__('_value_parameters', None)
+            for owner in self._owners:
+                owner._invalidate_plan()
+
+    def __getstate__(self):
+        """Leave out the owners when pickling and copying (a WeakSet can not be pickled)."""
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_owners' and hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_owners', weakref.WeakSet())
+
     @property
     def endianness(self):
         """
@@ -340,10 +367,10 @@ class CanSignalDefinition():
 
         """
         if self.signaltype == constants.CAN_SIGNALTYPE_UNSIGNED:
-            max_unpacked_value = 2 ** self.numberofbits - 1
+            max_unpacked_value = (1 << self.numberofbits) - 1
 
         elif self.signaltype == constants.CAN_SIGNALTYPE_SIGNED:
-            max_unpacked_value = 2 ** (self.numberofbits - 1) - 1
+            max_unpacked_value = (1 << (self.numberofbits - 1)) - 1
 
         elif self.signaltype == constants.CAN_SIGNALTYPE_SINGLE:
             max_unpacked_value = constants.MAX_VALUE_FLOAT_SINGLE
@@ -367,7 +394,7 @@ class CanSignalDefinition():
             min_unpacked_value = 0
 
         elif self.signaltype == constants.CAN_SIGNALTYPE_SIGNED:
-            min_unpacked_value = - 2 ** (self.numberofbits - 1)
+            min_unpacked_value = -(1 << (self.numberofbits - 1))
 
         elif self.signaltype == constants.CAN_SIGNALTYPE_SINGLE:
             min_unpacked_value = constants.MIN_VALUE_FLOAT_SINGLE
@@ -391,6 +418,46 @@ class CanSignalDefinition():
             bytenumber = stopbit // constants.BITS_PER_BYTE
         return bytenumber + 1
 
+    def _get_bit_layout(self):
+        """Get the location of the signal in the frame data, for use with integer shift and mask operations.
+
+        Returns the tuple (is_little_endian, shift, mask, sign_mask). The bus value is ``(dataint >> shift) & mask``,
+        where *dataint* is the frame data interpreted as an integer. For little endian signals *dataint* is
+        the data as a little endian integer, and for big endian signals the data padded to 8 bytes
+        as a big endian integer.
+
+        The *sign_mask* is the most significant bit of the signal. A signed bus value is converted
+        from two's complement by ``(bus_value ^ sign_mask) - sign_mask``.
+
+        The result is cached, and recalculated when any attribute is changed.
+
+        """
+        if self._bit_layout is None:
+            is_little_endian = self.endianness == constants.LITTLE_ENDIAN
+            if is_little_endian:
+                shift = self.startbit
+            else:
+                shift = utilities.calculate_backward_bitnumber(self.startbit)
+            mask = (1 << self.numberofbits) - 1  # Mask with ones in 'numberofbits' positions
+            sign_mask = 1 << (self.numberofbits - 1)
+            self._bit_layout = (is_little_endian, shift, mask, sign_mask)
+        return self._bit_layout
+
+    def _get_value_parameters(self):
+        """Get the attributes needed when converting between physical values and bus values.
+
+        Returns the tuple (signaltype, endianness, scalingfactor, valueoffset, minvalue, maxvalue,
+        minimum_possible_value, maximum_possible_value, minimum_dlc).
+
+        The result is cached, and recalculated when any attribute is changed.
+
+        """
+        if self._value_parameters is None:
+            self._value_parameters = (self.signaltype, self.endianness, self.scalingfactor, self.valueoffset,
+                                      self.minvalue, self.maxvalue, self.get_minimum_possible_value(),
+                                      self.get_maximum_possible_value(), self.get_minimum_dlc())
+        return self._value_parameters
+
     def _check_signal_value_range(self, attributename, value):
         if value is not None:
             try:
@@ -61,6 +61,7 @@ FORMAT_CAN_RAWFRAME = "=IB3x8s"  # CAN ID (4 bytes), DLC (1 byte), 3 pad bytes,
 SIZE_CAN_RAWFRAME = struct.calcsize(FORMAT_CAN_RAWFRAME)  # 16 bytes
 FORMAT_BCM_HEADER = "@3I4l2I0q" # interval seconds and useconds are platform dependent, others are 'uint32'. Pad bytes are required.
 SIZE_BCM_HEADER = struct.calcsize(FORMAT_BCM_HEADER)  # 56 bytes
+FORMAT_TIMESPEC = "@2l"  # struct timespec: seconds and nanoseconds, platform dependent size
 
 # KCD file details
 DEFAULT_BUSNAME = "Mainbus"
@@ -86,16 +87,26 @@ BCM_FLAG_RX_RTR_FRAME = 0x0400
 FLOAT_COMPARISON_EPSILON = 0.00001
 MICROSECONDS_PER_SECOND = 1000000
 MILLISECONDS_PER_SECOND = 1000
+NANOSECONDS_PER_SECOND = 1000000000
 
 # Implementation details
 FORMAT_FLOAT_DOUBLE_LITTLE_ENDIAN = "<d"  # 8 bytes
 FORMAT_FLOAT_DOUBLE_BIG_ENDIAN = ">d"  # 8 bytes
 FORMAT_FLOAT_SINGLE_BIG_ENDIAN = ">f"  # 4 bytes
+FORMAT_FLOAT_SINGLE_LITTLE_ENDIAN = "<f"  # 4 bytes
 FORMAT_DATA_LONGLONG = ">Q"  # Unsigned long long, 8 bytes
+FORMAT_DATA_LONGLONG_LITTLE_ENDIAN = "<Q"  # Unsigned long long, 8 bytes
 FORMAT_DATA_4BYTES_INT = ">I"  # Unsigned integer 4 bytes
 NULL_BYTE = b'\x00'
 MAX_NUMBER_OF_BYTES_FROM_BCM = 1024
 MAX_NUMBER_OF_RAW_RECEIVE_FILTERS = 100  # Arbitrary value. Seems to work fine.
+MAX_NUMBER_OF_MESSAGES_PER_SYSCALL = 1024  # UIO_MAXIOV in the Linux kernel, for sendmmsg() and recvmmsg()
+DEFAULT_NUMBER_OF_FRAMES_PER_RECEIVE = 64  # For recvmmsg()
+MIN_NUMBER_OF_FRAMES_PER_PROCESS = 20000  # For unpack_rawframes(). Fewer frames do not pay for starting a process.
+MSG_WAITFORONE = 0x10000  # Flag for recvmmsg(), from the Linux headers. Not available in the socket module.
+SO_BUSY_POLL = 46  # Socket option, from the Linux headers. Not available in the socket module.
+SO_TIMESTAMPNS = 35  # Socket option, from the Linux headers. Not available in the socket module.
+SCM_TIMESTAMPNS = SO_TIMESTAMPNS  # Ancillary message type for the SO_TIMESTAMPNS timestamps
 MAX_FRAME_CYCLETIME_MILLISECONDS = 60000  # Given in KCD file standard.
 
 # CAN frame state machine values
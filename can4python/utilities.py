@@ -31,6 +31,17 @@ import struct
 from . import constants
 from . import exceptions
 
+_DATA_BIG_STRUCT = struct.Struct(constants.FORMAT_DATA_LONGLONG)
+_DATA_LITTLE_STRUCT = struct.Struct(constants.FORMAT_DATA_LONGLONG_LITTLE_ENDIAN)
+
+# The backward bit numbering reverses the byte order but keeps the bit order within each byte. The byte number
+# is in bits 3-5 of the bit number, so the conversion (in both directions) is an XOR with 0b111000.
+_BYTE_REVERSAL_MASK = (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1) * constants.BITS_PER_BYTE
+
+# (minvalue, maxvalue, mask, modulus) for two's complement, indexed by the number of bits. Index 0 is unused.
+_TWOS_COMPLEMENT_LIMITS = (None,) + tuple((-(1 << (bits - 1)), (1 << (bits - 1)) - 1, (1 << bits) - 1, 1 << bits)
+                                          for bits in range(1, constants.BITS_IN_FULL_DATA + 1))
+
 
 def calculate_backward_bitnumber(normal_bitnumber):
     """Calculate the bit position in the "backward" numbering format.
@@ -71,10 +82,7 @@ def calculate_backward_bitnumber(normal_bitnumber):
         raise exceptions.CanException("The given normal_bitnumber is too small: {}".format(normal_bitnumber))
     if normal_bitnumber > constants.BITS_IN_FULL_DATA - 1:
         raise exceptions.CanException("The given normal_bitnumber is too large: {}".format(normal_bitnumber))
-    bytenumber = normal_bitnumber // constants.BITS_PER_BYTE
-    offset_in_the_byte = normal_bitnumber - bytenumber * constants.BITS_PER_BYTE  # MSbit=7, LSbit=0
-    basevalue_per_byte = (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1 - bytenumber) * constants.BITS_PER_BYTE
-    return basevalue_per_byte + offset_in_the_byte
+    return normal_bitnumber ^ _BYTE_REVERSAL_MASK
 
 
 def calculate_normal_bitnumber(backward_bitnumber):
@@ -98,13 +106,7 @@ def calculate_normal_bitnumber(backward_bitnumber):
         raise exceptions.CanException("The given backward_bitnumber is too small: {}".format(backward_bitnumber))
     if backward_bitnumber > constants.BITS_IN_FULL_DATA - 1:
         raise exceptions.CanException("The given backward_bitnumber is too large: {}".format(backward_bitnumber))
-    bytenumber = constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1 - backward_bitnumber // constants.BITS_PER_BYTE
-
-    # Most significant bit=7, Least significant bit=0
-    offset_in_the_byte = backward_bitnumber - \
-        (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1 - bytenumber) * constants.BITS_PER_BYTE
-
-    return offset_in_the_byte + bytenumber * constants.BITS_PER_BYTE
+    return backward_bitnumber ^ _BYTE_REVERSAL_MASK
 
 
 def generate_bit_byte_overview(inputstring, number_of_indent_spaces=4, show_reverse_bitnumbering=False):
@@ -165,10 +167,12 @@ def can_bytes_to_int(input_bytes):
     to an integer of 72057594037927936.
 
     """
-    assert len(input_bytes) <= constants.MAX_NUMBER_OF_CAN_DATA_BYTES, "Too large input to can_bytes_to_int."
-    framedata8bytes = bytes(input_bytes).ljust(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, constants.NULL_BYTE)
-    dataint = struct.unpack(constants.FORMAT_DATA_LONGLONG, framedata8bytes)[0]
-    return dataint
+    number_of_bytes = len(input_bytes)
+    assert number_of_bytes <= constants.MAX_NUMBER_OF_CAN_DATA_BYTES, "Too large input to can_bytes_to_int."
+    if number_of_bytes == constants.MAX_NUMBER_OF_CAN_DATA_BYTES:  # Most common, no padding needed
+        return _DATA_BIG_STRUCT.unpack(input_bytes)[0]
+    number_of_padding_bits = (constants.MAX_NUMBER_OF_CAN_DATA_BYTES - number_of_bytes) * constants.BITS_PER_BYTE
+    return int.from_bytes(input_bytes, 'big') << number_of_padding_bits
 
 
 def int_to_can_bytes(dlc, dataint):
@@ -187,8 +191,7 @@ def int_to_can_bytes(dlc, dataint):
     """
     dlc = int(dlc)
     assert dlc <= constants.MAX_NUMBER_OF_CAN_DATA_BYTES, "Too large dlc given to int_to_can_bytes."
-    framedata8bytes = bytes(struct.pack(constants.FORMAT_DATA_LONGLONG, dataint))
-    return framedata8bytes[0:dlc]
+    return _DATA_BIG_STRUCT.pack(dataint)[0:dlc]
 
 
 def twos_complement(value, bits):
@@ -205,15 +208,11 @@ def twos_complement(value, bits):
 
     """
     value = int(value)
-    bits = int(bits)
-    maxvalue = 2 ** (bits - 1) - 1
-    minvalue = - 2 ** (bits - 1)
+    minvalue, maxvalue, mask, _ = _get_twos_complement_limits(bits)
     if value > maxvalue or value < minvalue:
         raise exceptions.CanException("Wrong value for two's complement: {} Bits: {} Range: {}-{}".format(
             value, bits, minvalue, maxvalue))
-    if value >= 0:
-        return value
-    return value + 2 ** bits
+    return value & mask  # Python integers behave as two's complement with infinite sign extension
 
 
 def from_twos_complement(value, bits):
@@ -229,16 +228,35 @@ def from_twos_complement(value, bits):
 
     """
     value = int(value)
-    bits = int(bits)
-    maxvalue = (2 ** bits) - 1
-    if value < 0 or value > maxvalue:
+    _, max_positive_value, mask, modulus = _get_twos_complement_limits(bits)
+    if value < 0 or value > mask:
         raise exceptions.CanException("Wrong value for two's complement inverse: {} Bits: {} Range: 0-{}".format(
-            value, bits, maxvalue))
+            value, bits, mask))
 
-    max_positive_value = 2 ** (bits - 1) - 1
     if value <= max_positive_value:
         return value
-    return value - 2 ** bits
+    return value - modulus
+
+
+def _get_twos_complement_limits(bits):
+    """Look up the limits for two's complement values.
+
+    Args:
+      bits (int): field size, at least 1. The limits for 1 to 64 bits are precalculated.
+
+    Raises:
+      CanException: For wrong field size. See :exc:`.CanException`.
+
+    Returns (minvalue, maxvalue, mask, modulus) where the values are the signed range, mask has ones
+    in all *bits* positions and modulus is 2**bits.
+
+    """
+    bits = int(bits)
+    if bits < 1:
+        raise exceptions.CanException("Wrong number of bits for two's complement: {}".format(bits))
+    if bits > constants.BITS_IN_FULL_DATA:
+        return (-(1 << (bits - 1)), (1 << (bits - 1)) - 1, (1 << bits) - 1, 1 << bits)
+    return _TWOS_COMPLEMENT_LIMITS[bits]
 
 
 def split_seconds_to_full_and_part(seconds_float):
@@ -253,9 +271,11 @@ def split_seconds_to_full_and_part(seconds_float):
     """
     if seconds_float < 0:
         raise exceptions.CanException("Invalid time interval: {}".format(seconds_float))
-    seconds_full = math.floor(seconds_float)
-    useconds = int((seconds_float - seconds_full) * constants.MICROSECONDS_PER_SECOND)
-    return seconds_full, useconds
+    fraction, seconds_full = math.modf(seconds_float)
+    useconds = round(fraction * constants.MICROSECONDS_PER_SECOND)
+    if useconds == constants.MICROSECONDS_PER_SECOND:  # The fraction was rounded up to a full second
+        return int(seconds_full) + 1, 0
+    return int(seconds_full), useconds
 
 
 def check_frame_id_and_format(frame_id, frame_format):
@@ -313,23 +333,12 @@ def get_busvalue_from_bytes(input_bytes, endianness, numberofbits, startbit):
         bytenumber_for_stopbit_little = stopbit_little // constants.BITS_PER_BYTE
         assert bytenumber_for_stopbit_little < constants.MAX_NUMBER_OF_CAN_DATA_BYTES, \
             "The stopbit is wrong for LITTLE endian. Given startbit {}, numberofbits {}.".format(startbit, numberofbits)
-        number_of_bytes_to_shuffle = bytenumber_for_stopbit_little - bytenumber_for_startbit + 1
-        number_of_steps_to_LSBit_in_byte = startbit % constants.BITS_PER_BYTE
-
-        reshuffled_bytes = bytearray(constants.MAX_NUMBER_OF_CAN_DATA_BYTES)
-
-        #print("##", bytenumber_for_startbit, bytenumber_for_stopbit_little, number_of_bytes_to_shuffle, number_of_steps_to_LSBit_in_byte)
-
-        for i in range(number_of_bytes_to_shuffle):
-            bytenumber_origin = bytenumber_for_startbit + i
-            bytenumber_destination = constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1 - i  # Start from right
-            #print(i, bytenumber_origin, bytenumber_destination)
-            reshuffled_bytes[bytenumber_destination] = input_bytes[bytenumber_origin]
 
-        temporary_value = can_bytes_to_int(reshuffled_bytes)
+        # Interpreted as a little endian integer, the bit positions equal the normal bit numbering
+        dataint = int.from_bytes(input_bytes, 'little')
 
         # Rightshift so the interesting bits are rightmost
-        shifted = temporary_value >> number_of_steps_to_LSBit_in_byte  # Now BIG_ENDIAN
+        shifted = dataint >> startbit
 
     mask = (1 << numberofbits) - 1  # Mask with ones in 'numberofbits' positions
     return shifted & mask
@@ -350,30 +359,18 @@ def get_shiftedvalue_from_busvalue(input_value, endianness, numberofbits, startb
     bus value input_value '0110' is interpreted as the unsigned integer 6.
 
     """
-    encode_shifts = calculate_backward_bitnumber(startbit)  # Origin is BIG ENDIAN
-
     if endianness == constants.BIG_ENDIAN:
+        encode_shifts = calculate_backward_bitnumber(startbit)  # Origin is BIG ENDIAN
         shifted_value = input_value << encode_shifts  # Origin is BIG ENDIAN
         return shifted_value  # Still BIG_ENDIAN
 
-    else: # Origin is BIG ENDIAN, we should convert to LITTLE_ENDIAN.
-        number_of_steps_to_LSBit_in_byte = encode_shifts % constants.BITS_PER_BYTE
-        bytenumber_for_startbit = startbit // constants.BITS_PER_BYTE
+    else:  # Origin is BIG ENDIAN, we should convert to LITTLE_ENDIAN.
         stopbit_little = startbit + numberofbits - 1
-        bytenumber_for_stopbit_little = stopbit_little // constants.BITS_PER_BYTE
-        assert bytenumber_for_stopbit_little < constants.MAX_NUMBER_OF_CAN_DATA_BYTES, \
+        assert stopbit_little < constants.BITS_IN_FULL_DATA, \
             "The stopbit is wrong for LITTLE endian. Given startbit {}, numberofbits {}.".format(startbit, numberofbits)
-        number_of_bytes_to_shuffle = bytenumber_for_stopbit_little - bytenumber_for_startbit + 1
-
-        partially_shifted_value = input_value << number_of_steps_to_LSBit_in_byte
-        partially_shifted_bytes = int_to_can_bytes(constants.MAX_NUMBER_OF_CAN_DATA_BYTES, partially_shifted_value)
-        reshuffled_bytes = bytearray(constants.MAX_NUMBER_OF_CAN_DATA_BYTES)
-
-
-        for i in range(number_of_bytes_to_shuffle):
-            bytenumber_origin = constants.MAX_NUMBER_OF_CAN_DATA_BYTES - 1 - i  # Start from right
-            bytenumber_destination = bytenumber_for_startbit + i
-            #print(i, bytenumber_origin, bytenumber_destination)
-            reshuffled_bytes[bytenumber_destination] = partially_shifted_bytes[bytenumber_origin]
 
-        return can_bytes_to_int(reshuffled_bytes)
+        # Interpreted as a little endian integer, the bit positions equal the normal bit numbering.
+        # Swap the byte order to get the value as a big endian integer, like the frame data.
+        mask = (1 << numberofbits) - 1  # Mask with ones in 'numberofbits' positions
+        little_endian_value = (input_value & mask) << startbit
+        return _DATA_BIG_STRUCT.unpack(_DATA_LITTLE_STRUCT.pack(little_endian_value))[0]
@@ -14,6 +14,7 @@ Notes:
 
 
 """
+import collections
 import contextlib
 import copy
 import os.path
@@ -30,9 +31,11 @@ from can4python import canframe
 from can4python import configuration
 
 try:
-    from .test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus
+    from .test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, virtual_can_bus_is_up, \
+        wait_until_bound, CanFrameCapture
 except SystemError:  # When running this file directly
-    from test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus
+    from test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, virtual_can_bus_is_up, \
+        wait_until_bound, CanFrameCapture
 
 try:
     from .test_configuration import FRAME_ID_SEND, FRAME_ID_RECEIVE, TESTCONFIG1
@@ -44,6 +47,24 @@ try:
 except SystemError:
     from test_filehandler_kcd import INPUT_FILENAME, INPUT_FILENAME_NO_BUSDEFINITION
 
+CANSEND_ARGUMENT = "{:03x}#0102030405060708".format(FRAME_ID_RECEIVE)
+CANGEN_FRAME_ID_ARGUMENT = "{:3x}".format(FRAME_ID_RECEIVE)
+KNOWN_RESULT_SEND = b"[8]  02 03 00 05 04 00 00 01"
+KNOWN_RESULT_SEND_KEYWORD_ARGUMENTS = b"[8]  02 07 00 05 04 00 00 01"
+
+
+def count_candump_lines(output):
+    """Count the lines in candump output, in a single pass.
+
+    Args:
+        output (bytes): Output from candump
+
+    Returns a Counter with the line contents after the interface name as keys,
+    for example b"007   [8]  00 01 00 05 04 00 00 01".
+
+    """
+    return collections.Counter(line.split(None, 1)[-1].rstrip() for line in output.splitlines() if line.strip())
+
 
 class TestCanBus(unittest.TestCase):
 
@@ -59,29 +80,64 @@ class TestCanBus(unittest.TestCase):
     OUTPUT_FILENAME_6 = "test_out_6_TEMPORARY.kcd"
     OUTPUT_FILENAME_7 = "test_out_7_TEMPORARY.kcd"
 
-    def setUp(self):
-        enable_virtual_can_bus()
-        self.canbus_raw = canbus.CanBus(copy.deepcopy(TESTCONFIG1), VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.canbus_bcm = canbus.CanBus(copy.deepcopy(TESTCONFIG1), VIRTUAL_CAN_BUS_NAME, timeout=1.0, use_bcm=True)
+    @classmethod
+    def setUpClass(cls):
+        if not virtual_can_bus_is_up():
+            enable_virtual_can_bus()
 
         parent_directory = os.path.dirname(__file__)
-        self.input_filename = os.path.join(parent_directory, INPUT_FILENAME)
-        self.input_filename_no_busdefinition = os.path.join(parent_directory, INPUT_FILENAME_NO_BUSDEFINITION)
+        cls.input_filename = os.path.join(parent_directory, INPUT_FILENAME)
+        cls.input_filename_no_busdefinition = os.path.join(parent_directory, INPUT_FILENAME_NO_BUSDEFINITION)
+
+        # Expected candump output lines, after the interface name. See count_candump_lines().
+        cls.needle_periodic_a = ("%03d   [8]  00 01 00 05 04 00 00 01" % FRAME_ID_SEND).encode()
+        cls.needle_periodic_b = ("%03d   [8]  00 FF 00 05 04 00 00 01" % FRAME_ID_SEND).encode()
+        cls.needle_start_all = ("%03d   [8]  00 00 00 19 00 00 00 00" % FRAME_ID_SEND).encode()
+
+        cls.remove_output_files()  # Leftovers from an interrupted run. Each test cleans up in tearDown().
+
+        # The busses (and their sockets) are shared by the tests, and reset between the tests
+        cls.shared_canbus_raw = canbus.CanBus(copy.deepcopy(TESTCONFIG1), VIRTUAL_CAN_BUS_NAME, timeout=1.0)
+        cls.shared_canbus_bcm = canbus.CanBus(copy.deepcopy(TESTCONFIG1), VIRTUAL_CAN_BUS_NAME, timeout=1.0,
+                                              use_bcm=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.shared_canbus_raw.caninterface.close()
+        cls.shared_canbus_bcm.caninterface.close()
+
+    def setUp(self):
+        self.canbus_raw = self.shared_canbus_raw
+        self.canbus_bcm = self.shared_canbus_bcm
+        self.canbus_raw.reset()
+        self.canbus_bcm.reset()
 
         self.simulated_can_process = None
+        self.frame_capture = None
 
     def tearDown(self):
-        self.canbus_raw.caninterface.close()
-        self.canbus_bcm.caninterface.close()
         try:
             self.simulated_can_process.terminate()
+            self.simulated_can_process.wait()  # No frames from this test should reach the next one
         except (AttributeError, ProcessLookupError) as _:
             pass
-
-        for filename in [self.OUTPUT_FILENAME_4,
-                         self.OUTPUT_FILENAME_5,
-                         self.OUTPUT_FILENAME_6,
-                         self.OUTPUT_FILENAME_7]:
+        if self.frame_capture is not None:
+            self.frame_capture.stop()
+
+        # Some tests replace the busses with their own
+        if self.canbus_raw is not self.shared_canbus_raw:
+            self.canbus_raw.caninterface.close()
+        if self.canbus_bcm is not self.shared_canbus_bcm:
+            self.canbus_bcm.caninterface.close()
+
+        self.remove_output_files()
+
+    @classmethod
+    def remove_output_files(cls):
+        for filename in [cls.OUTPUT_FILENAME_4,
+                         cls.OUTPUT_FILENAME_5,
+                         cls.OUTPUT_FILENAME_6,
+                         cls.OUTPUT_FILENAME_7]:
             with contextlib.suppress(FileNotFoundError):
                 os.remove(filename)
 
@@ -103,8 +159,6 @@ class TestCanBus(unittest.TestCase):
         self.assertRaises(AttributeError, setattr, self.canbus_bcm, 'config', configuration.Configuration())
 
     def testConstructor(self):
-        self.canbus_raw.caninterface.close()
-
         config = configuration.Configuration()
         a = canbus.CanBus(config, VIRTUAL_CAN_BUS_NAME, timeout=1.0)
         self.assertEqual(a.caninterface.interfacename, VIRTUAL_CAN_BUS_NAME)
@@ -156,83 +210,75 @@ class TestCanBus(unittest.TestCase):
     def testSendRaw(self):
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
                                                        '-n', '1'],
-                                                      shell=False, universal_newlines=True,
+                                                      shell=False,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
         signalvalues_to_send = {'testsignal1': 1,
                                 'testsignal2': 256 * 2 + 3,
                                 'testsignal3': 256 * 4 + 5}
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
         self.canbus_raw.send_signals(signalvalues_to_send)
 
         out, err = self.simulated_can_process.communicate(timeout=2)
-        known_result = "[8]  02 03 00 05 04 00 00 01"
-        self.assertIn(known_result, out)
+        self.assertIn(KNOWN_RESULT_SEND, out)
 
     def testSendRawKeywordArguments(self):
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
                                                        '-n', '1'],
-                                                      shell=False, universal_newlines=True,
+                                                      shell=False,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
         self.canbus_raw.send_signals(testsignal1=1, testsignal2=256*2+7, testsignal3=256*4+5)
 
         out, err = self.simulated_can_process.communicate(timeout=2)
-        known_result = "[8]  02 07 00 05 04 00 00 01"
-        self.assertIn(known_result, out)
+        self.assertIn(KNOWN_RESULT_SEND_KEYWORD_ARGUMENTS, out)
 
     def testSendBcm(self):
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
                                                        '-n', '1'],
-                                                      shell=False, universal_newlines=True,
+                                                      shell=False,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
         signalvalues_to_send = {'testsignal1': 1,
                                 'testsignal2': 256 * 2 + 3,
                                 'testsignal3': 256 * 4 + 5}
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
         self.canbus_bcm.send_signals(signalvalues_to_send)
 
         out, err = self.simulated_can_process.communicate(timeout=2)
-        known_result = "[8]  02 03 00 05 04 00 00 01"
-        self.assertIn(known_result, out)
+        self.assertIn(KNOWN_RESULT_SEND, out)
 
     def testSendBcmFrame(self):
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
                                                        '-n', '1'],
-                                                      shell=False, universal_newlines=True,
+                                                      shell=False,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
         frame_to_send = canframe.CanFrame(FRAME_ID_SEND, b"\x02\x03\x00\x05\x04\x00\x00\x01")
         self.canbus_bcm.send_frame(frame_to_send)
 
         out, err = self.simulated_can_process.communicate(timeout=2)
-        known_result = "[8]  02 03 00 05 04 00 00 01"
-        self.assertIn(known_result, out)
+        self.assertIn(KNOWN_RESULT_SEND, out)
 
     def testSendSpeedAndDetectAllRaw(self):
 
         NUMBER_OF_FRAMES_TO_SEND = 1000  # Seems to give problems for larger values
 
-        self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
-                                                       "-n", str(NUMBER_OF_FRAMES_TO_SEND)],
-                                                      shell=False, universal_newlines=True,
-                                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        self.frame_capture = CanFrameCapture(FRAME_ID_SEND)
 
-        starttime = time.time()
-        for i in range(NUMBER_OF_FRAMES_TO_SEND):
-            signalvalues_to_send = {'testsignal1': 1,
-                                    'testsignal2': i,
-                                    'testsignal3': 256 * 4 + 5}
-            self.canbus_raw.send_signals(signalvalues_to_send)
+        signalvalue_sequences_to_send = {'testsignal1': [1] * NUMBER_OF_FRAMES_TO_SEND,
+                                         'testsignal2': range(NUMBER_OF_FRAMES_TO_SEND),
+                                         'testsignal3': [256 * 4 + 5] * NUMBER_OF_FRAMES_TO_SEND}
 
-        try:
-            self.simulated_can_process.communicate(timeout=10)
-        except subprocess.TimeoutExpired:
-            raise exceptions.CanTimeoutException("At least one of the {} sent frames was not seen by candump.".format(
-                NUMBER_OF_FRAMES_TO_SEND))
-        execution_time = time.time() - starttime
+        starttime = time.monotonic()
+        self.canbus_raw.send_signal_sequences(signalvalue_sequences_to_send)
+
+        self.frame_capture.wait_for_frames(NUMBER_OF_FRAMES_TO_SEND, timeout=10)
+        number_of_seen_frames = len(self.frame_capture.frames)
+        if number_of_seen_frames < NUMBER_OF_FRAMES_TO_SEND:
+            raise exceptions.CanTimeoutException("Only {} of the {} sent frames were seen on the bus.".format(
+                number_of_seen_frames, NUMBER_OF_FRAMES_TO_SEND))
+        execution_time = time.monotonic() - starttime
 
         time_per_loop_ms = 1000 * execution_time / NUMBER_OF_FRAMES_TO_SEND
         frames_per_seconds = NUMBER_OF_FRAMES_TO_SEND / execution_time
@@ -244,25 +290,21 @@ class TestCanBus(unittest.TestCase):
 
         NUMBER_OF_FRAMES_TO_SEND = 1000  # Seems to give problems for larger values
 
-        self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME,
-                                                       "-n", str(NUMBER_OF_FRAMES_TO_SEND)],
-                                                      shell=False, universal_newlines=True,
-                                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        self.frame_capture = CanFrameCapture(FRAME_ID_SEND)
 
-        starttime = time.time()
-        for i in range(NUMBER_OF_FRAMES_TO_SEND):
-            signalvalues_to_send = {'testsignal1': 1,
-                                    'testsignal2': i,
-                                    'testsignal3': 256 * 4 + 5}
-            self.canbus_bcm.send_signals(signalvalues_to_send)
+        signalvalue_sequences_to_send = {'testsignal1': [1] * NUMBER_OF_FRAMES_TO_SEND,
+                                         'testsignal2': range(NUMBER_OF_FRAMES_TO_SEND),
+                                         'testsignal3': [256 * 4 + 5] * NUMBER_OF_FRAMES_TO_SEND}
 
-        try:
-            self.simulated_can_process.communicate(timeout=10)
-        except subprocess.TimeoutExpired:
-            raise exceptions.CanTimeoutException("At least one of the {} sent frames was not seen by candump.".format(
-                NUMBER_OF_FRAMES_TO_SEND))
-        execution_time = time.time() - starttime
+        starttime = time.monotonic()
+        self.canbus_bcm.send_signal_sequences(signalvalue_sequences_to_send)
+
+        self.frame_capture.wait_for_frames(NUMBER_OF_FRAMES_TO_SEND, timeout=10)
+        number_of_seen_frames = len(self.frame_capture.frames)
+        if number_of_seen_frames < NUMBER_OF_FRAMES_TO_SEND:
+            raise exceptions.CanTimeoutException("Only {} of the {} sent frames were seen on the bus.".format(
+                number_of_seen_frames, NUMBER_OF_FRAMES_TO_SEND))
+        execution_time = time.monotonic() - starttime
 
         time_per_loop_ms = 1000 * execution_time / NUMBER_OF_FRAMES_TO_SEND
         frames_per_seconds = NUMBER_OF_FRAMES_TO_SEND / execution_time
@@ -280,9 +322,8 @@ class TestCanBus(unittest.TestCase):
         self.canbus_bcm = canbus.CanBus(config, VIRTUAL_CAN_BUS_NAME, timeout=1.0, use_bcm=True)
 
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME], shell=False,
-                                                      universal_newlines=True,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
         signalvalues_to_send = {'testsignal1': 1,
                                 'testsignal2': 1,
                                 'testsignal3': 256 * 4 + 5}
@@ -302,11 +343,12 @@ class TestCanBus(unittest.TestCase):
         out, err = self.simulated_can_process.communicate()
 
         projected_number_of_frames = MEASUREMENT_TIME * 1000 / TRANSMISSION_INTERVAL_MILLISECONDS
-        number_of_frames_A = out.count(" {:03.0f}   [8]  00 01 00 05 04 00 00 01".format(FRAME_ID_SEND))
+        line_counts = count_candump_lines(out)
+        number_of_frames_A = line_counts[self.needle_periodic_a]
         self.assertGreaterEqual(number_of_frames_A, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
         self.assertLessEqual(number_of_frames_A, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
 
-        number_of_frames_B = out.count(" {:03.0f}   [8]  00 FF 00 05 04 00 00 01".format(FRAME_ID_SEND))
+        number_of_frames_B = line_counts[self.needle_periodic_b]
         self.assertGreaterEqual(number_of_frames_B, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
         self.assertLessEqual(number_of_frames_B, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
 
@@ -321,9 +363,8 @@ class TestCanBus(unittest.TestCase):
         self.canbus_bcm = canbus.CanBus(config, VIRTUAL_CAN_BUS_NAME, timeout=1.0, use_bcm=True)
 
         self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME], shell=False,
-                                                      universal_newlines=True,
                                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
+        wait_until_bound(self.simulated_can_process.pid)
 
         self.canbus_bcm.start_sending_all_signals()
         time.sleep(MEASUREMENT_TIME)
@@ -337,7 +378,7 @@ class TestCanBus(unittest.TestCase):
         out, err = self.simulated_can_process.communicate()
 
         projected_number_of_frames = MEASUREMENT_TIME * 1000 / TRANSMISSION_INTERVAL_MILLISECONDS
-        number_of_frames = out.count(" {:03.0f}   [8]  00 00 00 19 00 00 00 00".format(FRAME_ID_SEND))
+        number_of_frames = out.count(b" " + self.needle_start_all)  # Single pattern, no need to split the lines
         self.assertGreaterEqual(number_of_frames, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
         self.assertLessEqual(number_of_frames, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
 
@@ -353,6 +394,20 @@ class TestCanBus(unittest.TestCase):
         self.assertRaises(exceptions.CanException, self.canbus_raw.send_signals)
         self.assertRaises(exceptions.CanException, self.canbus_bcm.send_signals)
 
+    def testSendBatchWrongSignal(self):
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signals_batch, [{'unknownsignal': 1}])
+        self.assertRaises(exceptions.CanException, self.canbus_bcm.send_signals_batch, [{'unknownsignal': 1}])
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signals_batch, ["unknownsignal"])
+        self.assertRaises(exceptions.CanException, self.canbus_bcm.send_signals_batch, ["unknownsignal"])
+
+    def testSendSequencesWrongSignal(self):
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signal_sequences, {'unknownsignal': [1]})
+        self.assertRaises(exceptions.CanException, self.canbus_bcm.send_signal_sequences, {'unknownsignal': [1]})
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signal_sequences, {'testsignal1': 1})
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signal_sequences, "testsignal1")
+        self.assertRaises(exceptions.CanException, self.canbus_raw.send_signal_sequences,
+                          {'testsignal1': [1, 1], 'testsignal2': [1]})
+
     def testSendWrongSignalValue(self):
         self.assertRaises(exceptions.CanException, self.canbus_raw.send_signals, {'testsignal1': 10 ** 10})
         self.assertRaises(exceptions.CanException, self.canbus_bcm.send_signals, {'testsignal1': 10 ** 10})
@@ -370,8 +425,7 @@ class TestCanBus(unittest.TestCase):
         self.canbus_bcm.init_reception()
 
     def testReceiveRaw(self):
-        canstring = "{:03x}#0102030405060708".format(FRAME_ID_RECEIVE)
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         result = self.canbus_raw.recv_next_signals()
         self.assertEqual(len(result), 4)
@@ -379,8 +433,8 @@ class TestCanBus(unittest.TestCase):
         self.assertEqual(result['testsignal12'], 258)  # 1 * 256 + 2
         self.assertEqual(result['testsignal13'], 1284)  # 5 * 256 + 4
 
-        time.sleep(0.1)
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process.communicate(timeout=2)
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         result = self.canbus_raw.recv_next_signals()
         self.assertEqual(len(result), 4)
@@ -388,8 +442,7 @@ class TestCanBus(unittest.TestCase):
     def testReceiveBcmAndStop(self):
         self.canbus_bcm.init_reception()
 
-        canstring = "{:03x}#0102030405060708".format(FRAME_ID_RECEIVE)
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         result = self.canbus_bcm.recv_next_signals()
         self.assertEqual(len(result), 4)
@@ -397,40 +450,41 @@ class TestCanBus(unittest.TestCase):
         self.assertEqual(result['testsignal12'], 258)  # 1 * 256 + 2
         self.assertEqual(result['testsignal13'], 1284)  # 5 * 256 + 4
 
-        time.sleep(0.1)
+        self.simulated_can_process.communicate(timeout=2)
         self.canbus_bcm.stop_reception()
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         self.assertRaises(exceptions.CanTimeoutException, self.canbus_bcm.recv_next_signals)
 
     def testReceiveBcmFrameAndStop(self):
         self.canbus_bcm.init_reception()
 
-        canstring = "{:03x}#0102030405060708".format(FRAME_ID_RECEIVE)
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         result = self.canbus_bcm.recv_next_frame()
         self.assertEqual(len(result), 8)
         self.assertEqual(result.frame_data, b"\x01\x02\x03\x04\x05\x06\x07\x08")
 
-        time.sleep(0.1)
+        self.simulated_can_process.communicate(timeout=2)
         self.canbus_bcm.stop_reception()
-        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, canstring],
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
                                                       shell=False, stderr=subprocess.STDOUT)
         self.assertRaises(exceptions.CanTimeoutException, self.canbus_bcm.recv_next_frame)
 
     def testReceiveSpeedRaw(self):
         self.canbus_raw.init_reception()
         self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", "{:3x}".format(FRAME_ID_RECEIVE),
+                                                       "-I", CANGEN_FRAME_ID_ARGUMENT,
                                                        "-L", str(self.FRAME_NUMBER_OF_DATABYTES),
                                                        "-D", "i",
                                                        "-g", str(self.FRAME_SENDER_SPACING_MILLISECONDS)],
                                                       shell=False, stderr=subprocess.STDOUT)
-        starttime = time.time()
+        self.canbus_raw.recv_next_signals()  # Warm-up, so the sender startup time is not measured
+
+        starttime = time.monotonic()
         for i in range(self.NUMBER_OF_LOOPS):
             self.canbus_raw.recv_next_signals()
-        execution_time = time.time() - starttime
+        execution_time = time.monotonic() - starttime
 
         time_per_loop_ms = 1000 * execution_time / self.NUMBER_OF_LOOPS
         frames_per_seconds = self.NUMBER_OF_LOOPS / execution_time
@@ -443,15 +497,17 @@ class TestCanBus(unittest.TestCase):
     def testReceiveSpeedBcm(self):
         self.canbus_bcm.init_reception()
         self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", "{:3x}".format(FRAME_ID_RECEIVE),
+                                                       "-I", CANGEN_FRAME_ID_ARGUMENT,
                                                        "-L", str(self.FRAME_NUMBER_OF_DATABYTES),
                                                        "-D", "i",
                                                        "-g", str(self.FRAME_SENDER_SPACING_MILLISECONDS)],
                                                       shell=False, stderr=subprocess.STDOUT)
-        starttime = time.time()
+        self.canbus_bcm.recv_next_signals()  # Warm-up, so the sender startup time is not measured
+
+        starttime = time.monotonic()
         for i in range(self.NUMBER_OF_LOOPS):
             self.canbus_bcm.recv_next_signals()
-        execution_time = time.time() - starttime
+        execution_time = time.monotonic() - starttime
 
         time_per_loop_ms = 1000 * execution_time / self.NUMBER_OF_LOOPS
         frames_per_seconds = self.NUMBER_OF_LOOPS / execution_time
@@ -464,7 +520,7 @@ class TestCanBus(unittest.TestCase):
     def testReceiveAllSentFramesRaw(self):
         self.canbus_raw.init_reception()
         self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", "{:3x}".format(FRAME_ID_RECEIVE),
+                                                       "-I", CANGEN_FRAME_ID_ARGUMENT,
                                                        "-L", str(self.FRAME_NUMBER_OF_DATABYTES),
                                                        "-D", "i",
                                                        "-g", str(self.FRAME_SENDER_SPACING_MILLISECONDS),
@@ -480,7 +536,7 @@ class TestCanBus(unittest.TestCase):
     def testReceiveAllSentFramesBcm(self):
         self.canbus_bcm.init_reception()
         self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", "{:3x}".format(FRAME_ID_RECEIVE),
+                                                       "-I", CANGEN_FRAME_ID_ARGUMENT,
                                                        "-L", str(self.FRAME_NUMBER_OF_DATABYTES),
                                                        "-D", "i",
                                                        "-g", str(self.FRAME_SENDER_SPACING_MILLISECONDS),
@@ -493,6 +549,24 @@ class TestCanBus(unittest.TestCase):
             raise exceptions.CanTimeoutException("Missed receiving at least one of the {} frames".format(
                 self.NUMBER_OF_LOOPS))
 
+    def testResetRaw(self):
+        self.canbus_raw.init_reception()
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
+                                                      shell=False, stderr=subprocess.STDOUT)
+        self.simulated_can_process.communicate(timeout=2)
+        self.canbus_raw.reset()
+        self.assertRaises(exceptions.CanTimeoutException, self.canbus_raw.recv_next_signals)
+
+    def testResetBcm(self):
+        self.canbus_bcm.init_reception()
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
+                                                      shell=False, stderr=subprocess.STDOUT)
+        self.simulated_can_process.communicate(timeout=2)
+        self.canbus_bcm.reset()
+        self.simulated_can_process = subprocess.Popen(["cansend", VIRTUAL_CAN_BUS_NAME, CANSEND_ARGUMENT],
+                                                      shell=False, stderr=subprocess.STDOUT)
+        self.assertRaises(exceptions.CanTimeoutException, self.canbus_bcm.recv_next_signals)
+
     def testReceiveNoData(self):
         self.assertRaises(exceptions.CanTimeoutException, self.canbus_raw.recv_next_signals)
         self.assertRaises(exceptions.CanTimeoutException, self.canbus_bcm.recv_next_signals)
@@ -500,39 +574,19 @@ class TestCanBus(unittest.TestCase):
     # Save configuration to file #
 
     def testSaveDefinitionToFileRaw(self):
-        try:
-            os.remove(self.OUTPUT_FILENAME_4)
-        except FileNotFoundError:
-            pass
-
         self.canbus_raw.write_configuration(self.OUTPUT_FILENAME_4)
         self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_4))
 
     def testSaveLoadedDefinitionToFileRaw(self):
-        try:
-            os.remove(self.OUTPUT_FILENAME_5)
-        except FileNotFoundError:
-            pass
-
         bus = canbus.CanBus.from_kcd_file(self.input_filename, VIRTUAL_CAN_BUS_NAME)
         bus.write_configuration(self.OUTPUT_FILENAME_5)
         self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_5))
 
     def testSaveDefinitionToFileBcm(self):
-        try:
-            os.remove(self.OUTPUT_FILENAME_6)
-        except FileNotFoundError:
-            pass
-
         self.canbus_bcm.write_configuration(self.OUTPUT_FILENAME_6)
         self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_6))
 
     def testSaveLoadedDefinitionToFileBcm(self):
-        try:
-            os.remove(self.OUTPUT_FILENAME_7)
-        except FileNotFoundError:
-            pass
-
         bus = canbus.CanBus.from_kcd_file(self.input_filename, VIRTUAL_CAN_BUS_NAME, use_bcm=True)
         bus.write_configuration(self.OUTPUT_FILENAME_7)
         self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_7))
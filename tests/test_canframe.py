@@ -13,6 +13,7 @@ import unittest
 
 assert sys.version_info >= (3, 3, 0), "Python version 3.3 or later required!"
 
+from can4python import constants
 from can4python import exceptions
 from can4python import cansignal
 from can4python import canframe_definition
@@ -70,6 +71,19 @@ class TestCanFrame(unittest.TestCase):
         self.assertEqual(frame2.frame_format, 'extended')
         self.assertEqual(frame2.frame_data, b'\x00\x00\x00\x00\x00\x00')
 
+    def testConstructorFromRawframeBuffer(self):
+        buffer = bytearray(b'\x07\x00\x00\x00\x08\x00\x00\x00\x01\x02\x03\x04\x05\x06\x07\x08' +
+                           b'\x03\x00\x00\x80\x02\x00\x00\x00\x0A\x0B\x00\x00\x00\x00\x00\x00')
+        frame1 = canframe.CanFrame._from_rawframe_buffer(buffer)
+        frame2 = canframe.CanFrame._from_rawframe_buffer(buffer, 16)
+        buffer[8] = 0xFF  # The frame data should be copied
+        self.assertEqual(frame1.frame_id, 7)
+        self.assertEqual(frame1.frame_format, 'standard')
+        self.assertEqual(frame1.frame_data, b'\x01\x02\x03\x04\x05\x06\x07\x08')
+        self.assertEqual(frame2.frame_id, 3)
+        self.assertEqual(frame2.frame_format, 'extended')
+        self.assertEqual(frame2.frame_data, b'\x0A\x0B')
+
     def testWrongConstructor(self):
         self.assertRaises(exceptions.CanException, canframe.CanFrame, -1, b'\x01')
         self.assertRaises(exceptions.CanException, canframe.CanFrame, None, b'\x01')
@@ -303,6 +317,25 @@ class TestCanFrame(unittest.TestCase):
         self.assertEqual(result['testsignal3'], 8)
         self.assertEqual(result['testsignal4'], 0)
 
+    def testUnpackAfterModification(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        self.frame.unpack(frame_defs)
+
+        self.testsig2.scalingfactor = 3
+        self.testsig4.signalname = 'testsignal4b'
+        self.frame_def.signaldefinitions.remove(self.testsig1)
+        result = self.frame.unpack(frame_defs)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result['testsignal2'], 6)
+        self.assertEqual(result['testsignal3'], 8)
+        self.assertEqual(result['testsignal4b'], 0)
+
+        self.frame_def.signaldefinitions[0] = self.testsig1  # Replace testsig2, keeping the length
+        self.testsig3.valueoffset = 1
+        result = self.frame.unpack(frame_defs)
+        self.assertEqual(sorted(result), ['testsignal1', 'testsignal3', 'testsignal4b'])
+        self.assertEqual(result['testsignal3'], 9)
+
     def testUnpackWrongFrameId(self):
         self.frame.frame_id = 2
         frame_defs = {self.frame_def.frame_id: self.frame_def}
@@ -314,6 +347,61 @@ class TestCanFrame(unittest.TestCase):
         frame_defs = {self.frame_def.frame_id: self.frame_def}
         self.assertRaises(exceptions.CanException, self.frame.unpack, frame_defs)
 
+    def testUnpackMany(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        frame2 = canframe.CanFrame(1, b'\x00\x03\x00\x09\x00\x00\x00\xff')
+        frame3 = canframe.CanFrame(2, b'\x00\x04\x00\x0A\x00\x00\x00\xff')
+        result = canframe.CanFrame.unpack_many([self.frame, frame3, frame2], frame_defs)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result['testsignal1'], [1, 1])
+        self.assertEqual(result['testsignal2'], [2, 3])
+        self.assertEqual(result['testsignal3'], [8, 9])
+        self.assertEqual(result['testsignal4'], [0, 0])
+
+    def testUnpackRawframes(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        frame2 = canframe.CanFrame(1, b'\x00\x03\x00\x09\x00\x00\x00\xff')
+        frame3 = canframe.CanFrame(2, b'\x00\x04\x00\x0A\x00\x00\x00\xff')
+        frames = [self.frame, frame3, frame2]
+        rawframes = b''.join(frame.get_rawframe() for frame in frames)
+        result = canframe.CanFrame.unpack_rawframes(rawframes, frame_defs)
+        self.assertEqual(result, canframe.CanFrame.unpack_many(frames, frame_defs))
+        self.assertEqual(result['testsignal2'], [2, 3])
+
+    def testUnpackRawframesParallel(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        frames = [canframe.CanFrame(1 + i % 2, bytes([0, i, 0, i + 1, 0, 0, 0, 0xFF])) for i in range(15)]
+        rawframes = b''.join(frame.get_rawframe() for frame in frames)
+        result = canframe.CanFrame.unpack_rawframes(rawframes, frame_defs, processes=2)  # Too few frames for a pool
+        self.assertEqual(result, canframe.CanFrame.unpack_rawframes(rawframes, frame_defs))
+        self.assertEqual(result['testsignal2'], list(range(0, 15, 2)))
+
+        repetitions = -(-2 * constants.MIN_NUMBER_OF_FRAMES_PER_PROCESS // len(frames))  # Rounded up
+        rawframes *= repetitions
+        result = canframe.CanFrame.unpack_rawframes(rawframes, frame_defs, processes=2)
+        self.assertEqual(result, canframe.CanFrame.unpack_rawframes(rawframes, frame_defs))
+        self.assertEqual(result['testsignal2'], list(range(0, 15, 2)) * repetitions)
+
+    def testUnpackRawframesWrongProcesses(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        rawframe = self.frame.get_rawframe()
+        self.assertRaises(exceptions.CanException, canframe.CanFrame.unpack_rawframes, rawframe, frame_defs, 0)
+        self.assertRaises(exceptions.CanException, canframe.CanFrame.unpack_rawframes, rawframe, frame_defs, 1.5)
+
+    def testUnpackRawframesWrongLength(self):
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        rawframe = self.frame.get_rawframe()
+        self.assertRaises(exceptions.CanException, canframe.CanFrame.unpack_rawframes, rawframe[:-1], frame_defs)
+
+        self.frame.frame_data = b'\x00\x02'
+        self.assertRaises(exceptions.CanException,
+                          canframe.CanFrame.unpack_rawframes, self.frame.get_rawframe(), frame_defs)
+
+    def testUnpackManyWrongFramelength(self):
+        self.frame.frame_data = b'\x00\x02'
+        frame_defs = {self.frame_def.frame_id: self.frame_def}
+        self.assertRaises(exceptions.CanException, canframe.CanFrame.unpack_many, [self.frame], frame_defs)
+
     def testRepr(self):
         result = repr(self.frame)
         known_result = "CAN frame ID: 1 (0x001, standard) data: 00 02 00 08 00 00 00 FF (8 bytes)"
@@ -110,6 +110,10 @@ class TestCanFrameDefinition(unittest.TestCase):
         self.frame_def.producer_ids = None
         self.assertEqual(self.frame_def.producer_ids, set())
 
+    def testProducerIdsAdd(self):
+        self.frame_def.producer_ids.add("1")
+        self.assertEqual(self.frame_def.producer_ids, set(["1", "9"]))
+
     def testPropertiesWrongValues(self):
         self.assertRaises(exceptions.CanException, setattr, self.frame_def, 'frame_id', -1)
         self.assertRaises(exceptions.CanException, setattr, self.frame_def, 'frame_id', 0x800)
@@ -156,6 +160,24 @@ class TestCanFrameDefinition(unittest.TestCase):
 
         self.assertEqual(self.frame_def.get_signal_mask(), b'\xff\xff\x00\xff\xff\x00\xff\x01')
 
+    def testGetSignalMaskAfterModification(self):
+        testsig2 = cansignal.CanSignalDefinition('testsignal2', 8, 16, endianness='big')  # Two leftmost bytes
+        testsig4 = cansignal.CanSignalDefinition('testsignal4', 48, 8, signaltype='signed')  # Second last byte
+
+        self.frame_def.signaldefinitions.append(testsig2)
+        self.assertEqual(self.frame_def.get_signal_mask(), b'\xff\xff\x00\x00\x00\x00\x00\x01')
+        self.frame_def.signaldefinitions.append(testsig4)
+        self.assertEqual(self.frame_def.get_signal_mask(), b'\xff\xff\x00\x00\x00\x00\xff\x01')
+        del self.frame_def.signaldefinitions[0]  # The signal from setUp
+        self.assertEqual(self.frame_def.get_signal_mask(), b'\xff\xff\x00\x00\x00\x00\xff\x00')
+        self.frame_def.signaldefinitions = [testsig2]
+        self.assertEqual(self.frame_def.get_signal_mask(), b'\xff\xff\x00\x00\x00\x00\x00\x00')
+        testsig2.numberofbits = 8
+        self.assertEqual(self.frame_def.get_signal_mask(), b'\x00\xff\x00\x00\x00\x00\x00\x00')
+
+    def testSignaldefinitionsWrongValues(self):
+        self.assertRaises(exceptions.CanException, setattr, self.frame_def, 'signaldefinitions', 3)
+
     def testRepr(self):
         print("\n\n\nRepresentation:")
         print(repr(self.frame_def))
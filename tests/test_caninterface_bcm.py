@@ -13,7 +13,6 @@ Notes:
   Must be run as sudo.
 
 """
-import subprocess
 import sys
 import time
 import unittest
@@ -25,9 +24,13 @@ from can4python import caninterface_bcm
 from can4python import exceptions
 
 try:
-    from .test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, disable_virtual_can_bus
+    from .test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, disable_virtual_can_bus, \
+        virtual_can_bus_is_up, InProcessCanFrameSender, CanFrameCapture, enlarge_socket_buffers, \
+        pinned_to_single_cpu, wait_for_frame
 except SystemError:  # When running this file directly
-    from test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, disable_virtual_can_bus
+    from test_caninterface_raw import VIRTUAL_CAN_BUS_NAME, enable_virtual_can_bus, disable_virtual_can_bus, \
+        virtual_can_bus_is_up, InProcessCanFrameSender, CanFrameCapture, enlarge_socket_buffers, \
+        pinned_to_single_cpu, wait_for_frame
 
 
 class TestSocketCanBcmInterface(unittest.TestCase):
@@ -39,50 +42,54 @@ class TestSocketCanBcmInterface(unittest.TestCase):
     FRAME_ID_RECEIVE = 4
     FRAME_ID_SEND = 1
     FRAME_NUMBER_OF_DATABYTES = 8
+    FRAME_ZEROS = canframe.CanFrame(FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')
+    FRAME_ONES = canframe.CanFrame(FRAME_ID_SEND, b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF')
+    FRAME_ZEROS_EXTENDED = canframe.CanFrame(FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00', 'extended')
+    FRAME_ONES_EXTENDED = canframe.CanFrame(FRAME_ID_SEND, b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF', 'extended')
 
     NONEXISTING_CAN_BUS_NAME = "vcan8"
     NONEXISTING_FRAME_ID = 22
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         enable_virtual_can_bus()
+
+    def setUp(self):
         self.interface = caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.simulated_can_process = None
+        enlarge_socket_buffers(self.interface)
+        self.frame_sender = None
+        self.frame_capture = None
 
     def tearDown(self):
         self.interface.close()
-        try:
-            self.simulated_can_process.terminate()
-        except (AttributeError, ProcessLookupError) as _:
-            pass
-        enable_virtual_can_bus()
-
-    def start_can_frame_sender(self, interval_milliseconds=FRAME_SENDER_SPACING_MILLISECONDS):
-        """Send CAN frames using the cangen command. Unlimited number of frames."""
-        self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", str(self.FRAME_ID_RECEIVE),
-                                                       "-L", str(self.FRAME_NUMBER_OF_DATABYTES),
-                                                       "-D", "i",
-                                                       "-g", str(interval_milliseconds)],
-                                                      shell=False, stderr=subprocess.STDOUT)
+        if self.frame_sender is not None:
+            self.frame_sender.stop()
+        if self.frame_capture is not None:
+            self.frame_capture.stop()
+        if not virtual_can_bus_is_up():  # Some tests disable the bus
+            enable_virtual_can_bus()
+
+    def start_can_frame_sender(self, interval_milliseconds=FRAME_SENDER_SPACING_MILLISECONDS,
+                               dlc=FRAME_NUMBER_OF_DATABYTES, number_of_frames=None, frame_data=None):
+        """Send CAN frames from a thread in this process. Unlimited number of frames by default.
+
+        See :class:`InProcessCanFrameSender` for the arguments.
+
+        """
+        self.frame_sender = InProcessCanFrameSender(self.FRAME_ID_RECEIVE, dlc, interval_milliseconds,
+                                                    number_of_frames, frame_data)
+
+    def start_frame_capture(self):
+        """Capture the frames sent by the interface under test (FRAME_ID_SEND) from now on."""
+        self.frame_capture = CanFrameCapture(self.FRAME_ID_SEND)
     # Creation etc #
 
     def testConstructor(self):
-        a = caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.assertEqual(a.interfacename, VIRTUAL_CAN_BUS_NAME)
-        a.close()
-        self.assertEqual(a.interfacename, VIRTUAL_CAN_BUS_NAME)
-        
-        b = caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.assertEqual(b.interfacename, VIRTUAL_CAN_BUS_NAME)
-        b.close()
-        
-        c = caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.assertEqual(c.interfacename, VIRTUAL_CAN_BUS_NAME)
-        c.close()
-        
-        d = caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0)
-        self.assertEqual(d.interfacename, VIRTUAL_CAN_BUS_NAME)
-        d.close()
+        interfaces = [caninterface_bcm.SocketCanBcmInterface(VIRTUAL_CAN_BUS_NAME, timeout=1.0) for _ in range(4)]
+        for interface in interfaces:
+            self.assertEqual(interface.interfacename, VIRTUAL_CAN_BUS_NAME)
+            interface.close()
+            self.assertEqual(interface.interfacename, VIRTUAL_CAN_BUS_NAME)
 
     def testConstructorWrongValue(self):
         self.assertRaises(exceptions.CanException, caninterface_bcm.SocketCanBcmInterface, VIRTUAL_CAN_BUS_NAME, -1)
@@ -145,6 +152,13 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         received_frame = self.interface.recv_next_frame()
         self.assertEqual(len(received_frame), self.FRAME_NUMBER_OF_DATABYTES)
 
+    def testReceiveDataWithTimestamp(self):
+        self.start_can_frame_sender()
+        self.interface.setup_reception(self.FRAME_ID_RECEIVE)
+        received_frame, timestamp = self.interface.recv_next_frame_with_timestamp()
+        self.assertEqual(len(received_frame), self.FRAME_NUMBER_OF_DATABYTES)
+        self.assertLess(abs(time.time() - timestamp), 1.0)
+
     def testReceiveStoppedReception(self):
         self.start_can_frame_sender()
         self.interface.setup_reception(self.FRAME_ID_RECEIVE)
@@ -157,15 +171,16 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         self.assertRaises(exceptions.CanTimeoutException, self.interface.recv_next_frame)
 
     def testReceiveSpeed(self):
-        self.start_can_frame_sender()
+        with pinned_to_single_cpu():  # The frame sender thread inherits the CPU affinity
+            self.start_can_frame_sender()
 
-        self.interface.setup_reception(self.FRAME_ID_RECEIVE)
-        time.sleep(0.1)
+            self.interface.setup_reception(self.FRAME_ID_RECEIVE)
+            self.assertTrue(wait_for_frame(self.FRAME_ID_RECEIVE))
 
-        starttime = time.time()
-        for i in range(self.NUMBER_OF_LOOPS):
-            self.interface.recv_next_frame()
-        execution_time = time.time() - starttime
+            starttime = time.perf_counter()
+            for i in range(self.NUMBER_OF_LOOPS):
+                self.interface.recv_next_frame()
+            execution_time = time.perf_counter() - starttime
 
         time_per_loop_ms = 1000 * execution_time / self.NUMBER_OF_LOOPS
         outputstring = "\n --> Received {} frames in {:.1f} s ({:.1f} ms per frame). Frame sender spacing {:.1f} ms.\n".\
@@ -178,16 +193,24 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         ALLOWED_RELATIVE_ERROR = 0.1
         nominal_time = THROTTLE_INTERVAL_MILLISECONDS * THROTTLE_LOOPS / 1000  # seconds
 
-        self.start_can_frame_sender()
-        self.interface.setup_reception(self.FRAME_ID_RECEIVE, min_interval=THROTTLE_INTERVAL_MILLISECONDS)
-        time.sleep(0.1)
-
-        starttime = time.time()
-        for i in range(THROTTLE_LOOPS):
-            self.interface.recv_next_frame()
-        execution_time = time.time() - starttime
+        with pinned_to_single_cpu():  # The frame sender thread inherits the CPU affinity
+            self.start_can_frame_sender()
+            self.interface.setup_reception(self.FRAME_ID_RECEIVE, min_interval=THROTTLE_INTERVAL_MILLISECONDS)
+            self.assertTrue(wait_for_frame(self.FRAME_ID_RECEIVE))
+
+            timestamps = []
+            starttime = time.perf_counter()
+            for i in range(THROTTLE_LOOPS):
+                frame, timestamp = self.interface.recv_next_frame_with_timestamp()
+                timestamps.append(timestamp)
+            execution_time = time.perf_counter() - starttime
         self.assertLess(abs(execution_time - nominal_time), ALLOWED_RELATIVE_ERROR * nominal_time)
 
+        # Use the kernel timestamps to check the mean interval. The first frame is passed on without throttling.
+        mean_interval_ms = 1000 * (timestamps[-1] - timestamps[1]) / (len(timestamps) - 2)
+        self.assertAlmostEqual(mean_interval_ms, THROTTLE_INTERVAL_MILLISECONDS,
+                               delta=ALLOWED_RELATIVE_ERROR * THROTTLE_INTERVAL_MILLISECONDS)
+
     def testReceiveDataChanged(self):
         """Verify that data change filtering works, by measuring time to receive a small number of frames from a larger data flow."""
         SENDER_INTERVAL_MILLISECONDS = 1
@@ -198,17 +221,21 @@ class TestSocketCanBcmInterface(unittest.TestCase):
 
         self.start_can_frame_sender(SENDER_INTERVAL_MILLISECONDS)
         self.interface.setup_reception(self.FRAME_ID_RECEIVE, data_mask=DATA_MASK)
-        time.sleep(0.1)
+        self.assertTrue(wait_for_frame(self.FRAME_ID_RECEIVE))
 
-        starttime = time.time()
+        number_of_sent_frames_at_start = self.frame_sender.number_of_sent_frames
+        starttime = time.perf_counter()
         for i in range(DATA_CHANGED_LOOPS):
             self.interface.recv_next_frame()
-        execution_time = time.time() - starttime
+        execution_time = time.perf_counter() - starttime
+        number_of_masked_frames = self.frame_sender.number_of_sent_frames - number_of_sent_frames_at_start
         
         allowed_error = ALLOWED_RELATIVE_ERROR * nominal_time
         time_error = abs(execution_time - nominal_time)
         outputstring = "\n --> Received {} frames in {:.1f} s, nominal time {:.1f} s. Error {:.1f} s (allowed {:.1f} s).\n".\
             format(DATA_CHANGED_LOOPS, execution_time, nominal_time, time_error, allowed_error)
+        outputstring += " --> The kernel compared {} frames to the data mask ({:.1f} us per compared frame).\n".\
+            format(number_of_masked_frames, 1000000 * execution_time / max(number_of_masked_frames, 1))
         print(outputstring)
         self.assertLess(time_error, allowed_error)
 
@@ -221,18 +248,12 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         nominal_time = SENDER_INTERVAL_MILLISECONDS * DATA_CHANGED_LOOPS * 128 / 1000
 
         self.interface.setup_reception(self.FRAME_ID_RECEIVE, data_mask=DATA_MASK)
-        time.sleep(0.1)
-
-        self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", str(self.FRAME_ID_RECEIVE),
-                                                       "-L", "3",
-                                                       "-D", "i",
-                                                       "-g", str(SENDER_INTERVAL_MILLISECONDS)],
-                                                      shell=False, stderr=subprocess.STDOUT)
-        starttime = time.time()
+
+        self.start_can_frame_sender(SENDER_INTERVAL_MILLISECONDS, dlc=3)
+        starttime = time.perf_counter()
         for i in range(DATA_CHANGED_LOOPS):
             self.interface.recv_next_frame()
-        execution_time = time.time() - starttime
+        execution_time = time.perf_counter() - starttime
 
         allowed_error = ALLOWED_RELATIVE_ERROR * nominal_time
         time_error = abs(execution_time - nominal_time)
@@ -245,26 +266,17 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         """Verify that we are receiving frames where each frame is longer (or no data) than the previous."""
         SENDER_INTERVAL_MILLISECONDS = 1
         NUMBER_OF_DLC_FRAMES = 30
+        IDLE_TIME = 0.3  # seconds
         DATA_MASK = b"\x00\x00\x00\x00\x00\x00\x00\x00"  # Do not look at data changes
         self.interface.setup_reception(self.FRAME_ID_RECEIVE, data_mask=DATA_MASK)
-        self.simulated_can_process = subprocess.Popen(["cangen", VIRTUAL_CAN_BUS_NAME,
-                                                       "-I", str(self.FRAME_ID_RECEIVE),
-                                                       "-L", "i",
-                                                       "-D", "0102030405060708",
-                                                       "-n", str(NUMBER_OF_DLC_FRAMES),
-                                                       "-g", str(SENDER_INTERVAL_MILLISECONDS)],
-                                                      shell=False, stderr=subprocess.STDOUT)
-        number_of_received_frames = 0
-        while True:
-            try:
-                self.interface.recv_next_frame()
-                number_of_received_frames += 1
-            except exceptions.CanTimeoutException:
-                break
-        self.assertEqual(number_of_received_frames, NUMBER_OF_DLC_FRAMES)
+        self.start_can_frame_sender(SENDER_INTERVAL_MILLISECONDS, dlc=None, number_of_frames=NUMBER_OF_DLC_FRAMES,
+                                    frame_data=b"\x01\x02\x03\x04\x05\x06\x07\x08")
+        frames = self.interface.recv_frames_until_idle(NUMBER_OF_DLC_FRAMES + 1, IDLE_TIME)
+        self.assertEqual(len(frames), NUMBER_OF_DLC_FRAMES)
 
     def testReceiveNoData(self):
         self.assertRaises(exceptions.CanTimeoutException, self.interface.recv_next_frame)
+        self.assertEqual(self.interface.recv_frames_until_idle(10, 0.1), [])
 
     def testReceiveClosedBus(self):
         disable_virtual_can_bus()
@@ -272,7 +284,9 @@ class TestSocketCanBcmInterface(unittest.TestCase):
 
     def testReceiveClosedInterface(self):
         self.interface.close()
+        self.assertRaises(exceptions.CanException, self.interface.recv_frames_until_idle, 1, 0.1)
         self.assertRaises(exceptions.CanException, self.interface.recv_next_frame)
+        self.assertRaises(exceptions.CanException, self.interface.recv_next_frame_with_timestamp)
 
     # Send #
 
@@ -281,121 +295,115 @@ class TestSocketCanBcmInterface(unittest.TestCase):
         self.assertRaises(exceptions.CanException, self.interface.send_frame, "ABC")
 
     def testSendSingleFrame(self):
-        self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME, '-n', '1'], shell=False,
-                                                      universal_newlines=True,
-                                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
-        frame = canframe.CanFrame.from_empty_bytes(self.FRAME_ID_SEND, self.FRAME_NUMBER_OF_DATABYTES)
+        self.start_frame_capture()
+        frame = self.FRAME_ZEROS
         self.interface.send_frame(frame)
 
-        print("\nWaiting for a subprocess to receive a single CAN frame, sent via 'send_frame'.")
-        out, err = self.simulated_can_process.communicate()
-        print("Confirmed CAN frame.")
-
-        known_result = "[8]  00 00 00 00 00 00 00 00"
-        self.assertIn(known_result, out)
+        self.frame_capture.wait_for_frames(1)
+        self.assertEqual(self.frame_capture.frames, [(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')])
 
     def testSetupPeriodicSendWrongValue(self):
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')
+        frame_zeros = self.FRAME_ZEROS
         self.assertRaises(exceptions.CanException, self.interface.setup_periodic_send, frame_zeros, -1)
 
     def testSetupPeriodicSendWrongType(self):
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')
+        frame_zeros = self.FRAME_ZEROS
         self.assertRaises(exceptions.CanException, self.interface.setup_periodic_send, 1)
         self.assertRaises(exceptions.CanException, self.interface.setup_periodic_send, frame_zeros, "ABC")
 
     def testSetupPeriodicSendWrongType(self):
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')
+        frame_zeros = self.FRAME_ZEROS
         self.assertRaises(exceptions.CanException, self.interface.setup_periodic_send, 1)
         self.assertRaises(exceptions.CanException, self.interface.setup_periodic_send, frame_zeros, "ABC")
 
-    def testSendPeriodicAndChangeFrameAndStop(self):
-        """Start periodic CAN transmission, update frame data (not interval), and finally stop transmission."""
-        RESULT_ALLOWED_DIFFERENCE = 5 # Number of missed frames, or when stopping sending too late.
-        TRANSMISSION_INTERVAL_MILLISECONDS = 20
-        MEASUREMENT_TIME = 1  # seconds
-
-        self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME], shell=False,
-                                                      universal_newlines=True,
-                                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00')
-        frame_ones = canframe.CanFrame(self.FRAME_ID_SEND, b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF')
-
-        print("\nSetting up periodic CAN frame transmission.")
-        self.interface.setup_periodic_send(frame_zeros, TRANSMISSION_INTERVAL_MILLISECONDS)
-        time.sleep(MEASUREMENT_TIME)
-
-        self.interface.setup_periodic_send(frame_ones, restart_timer=False)
-        time.sleep(MEASUREMENT_TIME)
-
-        self.interface.stop_periodic_send(self.FRAME_ID_SEND)
-        time.sleep(MEASUREMENT_TIME)
-
-        self.simulated_can_process.terminate()
-        out, err = self.simulated_can_process.communicate()
-        print("Periodic CAN frame transmission done.")
+    def testSetupPeriodicSendSpeed(self):
+        NUMBER_OF_TASKS = 100
+        TRANSMISSION_INTERVAL_MILLISECONDS = 100
+        interval = TRANSMISSION_INTERVAL_MILLISECONDS / 1000  # seconds
+
+        frames = [canframe.CanFrame(frame_id, b'\x00\x00\x00\x00\x00\x00\x00\x00')
+                  for frame_id in range(self.FRAME_ID_SEND, self.FRAME_ID_SEND + NUMBER_OF_TASKS)]
+        self.frame_capture = CanFrameCapture()
+        starttime = time.perf_counter()
+        for frame in frames:
+            self.interface.setup_periodic_send(frame, TRANSMISSION_INTERVAL_MILLISECONDS)
+        execution_time = time.perf_counter() - starttime
+
+        # All tasks should be sending. Wait for two intervals worth of frames.
+        self.frame_capture.wait_for_frames(2 * NUMBER_OF_TASKS, timeout=5 * interval)
+        sent_frame_ids = set(frame_id for frame_id, _, _ in self.frame_capture.get_frame_counts())
+        self.assertEqual(sent_frame_ids, set(frame.frame_id for frame in frames))
+
+        for frame in frames:
+            self.interface.stop_periodic_send(frame.frame_id)
+        time.sleep(interval / 2)  # Frames already on their way
+        number_of_frames_at_stop = len(self.frame_capture.frames)
+        time.sleep(2 * interval)
+        self.assertEqual(len(self.frame_capture.frames), number_of_frames_at_stop)
+
+        outputstring = "\n --> Set up {} periodic transmissions in {:.1f} ms ({:.1f} us each).\n".\
+            format(NUMBER_OF_TASKS, 1000 * execution_time, 1000000 * execution_time / NUMBER_OF_TASKS)
+        print(outputstring)
 
-        projected_number_of_frames = MEASUREMENT_TIME * 1000 / TRANSMISSION_INTERVAL_MILLISECONDS
-        number_of_frames_zeros = out.count(" {:03.0f}   [8]  00 00 00 00 00 00 00 00".format(self.FRAME_ID_SEND))
-        self.assertGreaterEqual(number_of_frames_zeros, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
-        self.assertLessEqual(number_of_frames_zeros, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
+    def check_periodic_send_change_and_stop(self, frame_zeros, frame_ones, frame_format):
+        """Start periodic CAN transmission, update frame data (not interval), and finally stop transmission.
 
-        number_of_frames_ones = out.count(" {:03.0f}   [8]  FF FF FF FF FF FF FF FF".format(self.FRAME_ID_SEND))
-        self.assertGreaterEqual(number_of_frames_ones, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
-        self.assertLessEqual(number_of_frames_ones, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
+        Instead of sleeping for a fixed time, waits for an explicit number of frames and checks the time it took.
 
-    def testSendPeriodicAndChangeFrameAndStopExtended(self):
-        """Start periodic CAN transmission, update frame data (not interval), and finally stop transmission."""
+        """
         RESULT_ALLOWED_DIFFERENCE = 5 # Number of missed frames, or when stopping sending too late.
         TRANSMISSION_INTERVAL_MILLISECONDS = 20
-        MEASUREMENT_TIME = 1  # seconds
-
-        self.simulated_can_process = subprocess.Popen(['candump', VIRTUAL_CAN_BUS_NAME], shell=False,
-                                                      universal_newlines=True,
-                                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(0.1)
-
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00', 'extended')
-        frame_ones = canframe.CanFrame(self.FRAME_ID_SEND, b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF', 'extended')
-
+        NUMBER_OF_FRAMES = 50
+        STOP_CHECK_TIME = 2 * RESULT_ALLOWED_DIFFERENCE * TRANSMISSION_INTERVAL_MILLISECONDS / 1000  # seconds
+        nominal_time = NUMBER_OF_FRAMES * TRANSMISSION_INTERVAL_MILLISECONDS / 1000  # seconds
+        allowed_time_error = RESULT_ALLOWED_DIFFERENCE * TRANSMISSION_INTERVAL_MILLISECONDS / 1000  # seconds
+        timeout = 2 * nominal_time
+
+        self.start_frame_capture()
+        starttime = time.perf_counter()
         self.interface.setup_periodic_send(frame_zeros, TRANSMISSION_INTERVAL_MILLISECONDS)
-        time.sleep(MEASUREMENT_TIME)
+        number_of_frames_zeros = self.frame_capture.count_frames_until(
+            NUMBER_OF_FRAMES, self.FRAME_ID_SEND, frame_zeros.frame_data, frame_format, timeout)
+        execution_time_zeros = time.perf_counter() - starttime
 
+        starttime = time.perf_counter()
         self.interface.setup_periodic_send(frame_ones, restart_timer=False)
-        time.sleep(MEASUREMENT_TIME)
+        number_of_frames_ones = self.frame_capture.count_frames_until(
+            NUMBER_OF_FRAMES, self.FRAME_ID_SEND, frame_ones.frame_data, frame_format, timeout)
+        execution_time_ones = time.perf_counter() - starttime
 
-        self.interface.stop_periodic_send(self.FRAME_ID_SEND, 'extended')
-        time.sleep(MEASUREMENT_TIME)
+        self.interface.stop_periodic_send(self.FRAME_ID_SEND, frame_format)
+        time.sleep(STOP_CHECK_TIME)
+        number_of_frames_after_stop = self.frame_capture.count_frames_until(
+            0, self.FRAME_ID_SEND, frame_ones.frame_data, frame_format) - number_of_frames_ones
 
-        self.simulated_can_process.terminate()
-        out, err = self.simulated_can_process.communicate()
+        self.assertEqual(number_of_frames_zeros, NUMBER_OF_FRAMES)
+        self.assertAlmostEqual(execution_time_zeros, nominal_time, delta=allowed_time_error)
+        self.assertEqual(number_of_frames_ones, NUMBER_OF_FRAMES)
+        self.assertAlmostEqual(execution_time_ones, nominal_time, delta=allowed_time_error)
+        self.assertLessEqual(number_of_frames_after_stop, 1)
 
-        projected_number_of_frames = MEASUREMENT_TIME * 1000 / TRANSMISSION_INTERVAL_MILLISECONDS
-
-        number_of_frames_zeros = out.count(" {:08.0f}   [8]  00 00 00 00 00 00 00 00".format(self.FRAME_ID_SEND))
-        self.assertGreaterEqual(number_of_frames_zeros, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
-        self.assertLessEqual(number_of_frames_zeros, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
+    def testSendPeriodicAndChangeFrameAndStop(self):
+        self.check_periodic_send_change_and_stop(self.FRAME_ZEROS, self.FRAME_ONES, 'standard')
 
-        number_of_frames_ones = out.count(" {:08.0f}   [8]  FF FF FF FF FF FF FF FF".format(self.FRAME_ID_SEND))
-        self.assertGreaterEqual(number_of_frames_ones, projected_number_of_frames - RESULT_ALLOWED_DIFFERENCE)
-        self.assertLessEqual(number_of_frames_ones, projected_number_of_frames + RESULT_ALLOWED_DIFFERENCE)
+    def testSendPeriodicAndChangeFrameAndStopExtended(self):
+        self.check_periodic_send_change_and_stop(self.FRAME_ZEROS_EXTENDED, self.FRAME_ONES_EXTENDED, 'extended')
 
     def testStopNonexistingPeriodicTask(self):
         self.assertRaises(exceptions.CanException, self.interface.stop_periodic_send, self.FRAME_ID_SEND)
 
         TRANSMISSION_INTERVAL_MILLISECONDS = 20
-        frame_zeros = canframe.CanFrame(self.FRAME_ID_SEND, b'\x00\x00\x00\x00\x00\x00\x00\x00', 'standard')
+        frame_zeros = self.FRAME_ZEROS
         self.interface.setup_periodic_send(frame_zeros, TRANSMISSION_INTERVAL_MILLISECONDS)
         self.assertRaises(exceptions.CanException, self.interface.stop_periodic_send, self.FRAME_ID_SEND, 'extended')
 
     def testSendClosedBus(self):
         disable_virtual_can_bus()
-        frame = canframe.CanFrame.from_empty_bytes(self.FRAME_ID_SEND, self.FRAME_NUMBER_OF_DATABYTES)
+        frame = self.FRAME_ZEROS
         self.assertRaises(exceptions.CanException, self.interface.send_frame, frame)
 
     def testSendClosedInterface(self):
-        frame = canframe.CanFrame.from_empty_bytes(self.FRAME_ID_SEND, self.FRAME_NUMBER_OF_DATABYTES)
+        frame = self.FRAME_ZEROS
         self.interface.close()
         self.assertRaises(exceptions.CanException, self.interface.send_frame, frame)
 
@@ -8,6 +8,7 @@ test_cansignal
 Tests for `cansignal` module.
 """
 
+import os
 import sys
 import unittest
 
@@ -17,11 +18,59 @@ from can4python import constants
 from can4python import exceptions
 from can4python import cansignal
 
+VERBOSE = bool(os.environ.get('CAN4PY_VERBOSE_TESTS'))  # Print output for manual checking
+
+# (positional arguments after the signal name, keyword arguments)
+WRONG_CONSTRUCTOR_ARGUMENTS = (
+    ((63, 1), {'scalingfactor': -1}),
+    ((64, 1), {}),
+    ((-1, 1), {}),
+    ((56, 0), {}),
+    ((56, 65), {}),
+    ((63, 2), {'endianness': 'little'}),  # Owerflows to bitnumber 64
+    ((7, 2), {'endianness': 'big'}),  # Owerflows to the left
+    ((20, 5, "ABC"), {}),
+    ((20, 5, None), {}),
+    ((20, 5, "1,0"), {}),
+    ((20, 5, 1, None), {}),
+    ((20, 5, 1, "ABC"), {}),
+    ((20, 5, 1, "1,0"), {}),
+    ((56, 1), {'endianness': 'A'}),
+    ((56, 1), {'endianness': 2}),
+    ((56, 1), {'endianness': None}),
+)
+
+# (attribute name, value) for a little endian unsigned 1-bit signal at startbit 56
+WRONG_PROPERTY_VALUES = (
+    ('startbit', -1),
+    ('startbit', 64),
+    ('startbit', None),
+    ('numberofbits', -1),
+    ('numberofbits', 0),
+    ('numberofbits', None),
+    ('endianness', 1),
+    ('endianness', 'ABC'),
+    ('endianness', None),
+    ('signaltype', 1),
+    ('signaltype', 'ABC'),
+    ('signaltype', None),
+    ('maxvalue', 2),
+    ('maxvalue', -1),
+    ('maxvalue', 'ABC'),
+    ('minvalue', -1),
+    ('minvalue', 2),
+    ('minvalue', 'ABC'),
+    ('defaultvalue', -1),
+    ('defaultvalue', 2),
+    ('defaultvalue', 'ABC'),
+    ('scalingfactor', 'ABC'),
+    ('scalingfactor', None),
+    ('valueoffset', 'ABC'),
+    ('valueoffset', None),
+)
 
-class TestCanSignal(unittest.TestCase):
 
-    def setUp(self):
-        self.signal = cansignal.CanSignalDefinition('testsignal', 56, 1)  # Least significant bit in last byte
+class TestCanSignal(unittest.TestCase):
 
     def testConstructor(self):
         sig = cansignal.CanSignalDefinition('testsignal', 56, 1)  # Least significant bit in last byte
@@ -61,32 +110,12 @@ class TestCanSignal(unittest.TestCase):
         self.assertEqual(sig.defaultvalue, 1)
 
     def testConstructorWrongValues(self):
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 63, 1, scalingfactor=-1)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 64, 1)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', -1, 1)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 56, 0)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 56, 65)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition,
-                          'testsignal', 63, 2, endianness='little')  # Owerflows to bitnumber 64
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition,
-                          'testsignal', 7, 2, endianness='big')  # Owerflows to the left
-
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, "ABC")
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, None)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, "1,0")
-
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, 1, None)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, 1, "ABC")
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition, 'testsignal', 20, 5, 1, "1,0")
-
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition,
-                          'testsignal', 56, 1, endianness='A')
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition,
-                          'testsignal', 56, 1, endianness=2)
-        self.assertRaises(exceptions.CanException, cansignal.CanSignalDefinition,
-                          'testsignal', 56, 1, endianness=None)
+        for args, kwargs in WRONG_CONSTRUCTOR_ARGUMENTS:
+            with self.assertRaises(exceptions.CanException, msg="args: {} kwargs: {}".format(args, kwargs)):
+                cansignal.CanSignalDefinition('testsignal', *args, **kwargs)
 
     def testProperties(self):
+        self.signal = cansignal.CanSignalDefinition('testsignal', 56, 1)  # Least significant bit in last byte
         self.assertEqual(self.signal.signalname, 'testsignal')
         self.assertEqual(self.signal.startbit, 56)
         self.assertEqual(self.signal.numberofbits, 1)
@@ -124,31 +153,10 @@ class TestCanSignal(unittest.TestCase):
         self.assertEqual(self.signal.comment, "ABC")
 
     def testPropertiesWrongValues(self):
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'startbit', -1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'startbit', 64)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'startbit', None)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'numberofbits', -1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'numberofbits', 0)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'numberofbits', None)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'endianness', 1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'endianness', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'endianness', None)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'signaltype', 1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'signaltype', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'signaltype', None)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'maxvalue', 2)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'maxvalue', -1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'maxvalue', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'minvalue', -1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'minvalue', 2)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'minvalue', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'defaultvalue', -1)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'defaultvalue', 2)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'defaultvalue', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'scalingfactor', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'scalingfactor', None)
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'valueoffset', 'ABC')
-        self.assertRaises(exceptions.CanException, setattr, self.signal, 'valueoffset', None)
+        self.signal = cansignal.CanSignalDefinition('testsignal', 56, 1)  # Least significant bit in last byte
+        for attributename, value in WRONG_PROPERTY_VALUES:
+            with self.assertRaises(exceptions.CanException, msg="{} = {!r}".format(attributename, value)):
+                setattr(self.signal, attributename, value)
 
         sig = cansignal.CanSignalDefinition('testsignal', 56, 1, endianness='big')
         sig.signaltype = constants.CAN_SIGNALTYPE_SINGLE
@@ -158,27 +166,34 @@ class TestCanSignal(unittest.TestCase):
         self.assertRaises(exceptions.CanException, setattr, sig, 'numberofbits', 63)
 
     def testRepr(self):
-        print('\nOutput from repr():')  # Check the output manually
         sig = cansignal.CanSignalDefinition('testsignal', 56, 1, comment="ABC")
-        print(repr(sig))
+        results = [repr(sig)]
 
         comment = "ABC" + " " * 100
         sig = cansignal.CanSignalDefinition('testsignal', 56, 1, comment=comment, endianness='big')
-        print(repr(sig))
+        results.append(repr(sig))
+
+        if VERBOSE:
+            print('\nOutput from repr():')  # Check the output manually
+            print('\n'.join(results))
 
     def testGetDescriptiveAsciiArt(self):
-        print('\nOutput from get_descriptive_ascii_art():')  # Check the output manually
+        results = []
         sig = cansignal.CanSignalDefinition('testsignalA', 56, 1)
-        print(sig.get_descriptive_ascii_art())
+        results.append(sig.get_descriptive_ascii_art())
 
         sig = cansignal.CanSignalDefinition('testsignalB', 54, 4)
-        print(sig.get_descriptive_ascii_art())
+        results.append(sig.get_descriptive_ascii_art())
 
         sig = cansignal.CanSignalDefinition('testsignalC', 54, 2, endianness='big')
-        print(sig.get_descriptive_ascii_art())
+        results.append(sig.get_descriptive_ascii_art())
 
         sig = cansignal.CanSignalDefinition('testsignalD', 54, 4, endianness='big')
-        print(sig.get_descriptive_ascii_art())
+        results.append(sig.get_descriptive_ascii_art())
+
+        if VERBOSE:
+            print('\nOutput from get_descriptive_ascii_art():')  # Check the output manually
+            print('\n'.join(results))
 
     def testMaximumPossibleValueGet(self):
         sig = cansignal.CanSignalDefinition('testsignal', 56, 3, scalingfactor=2, valueoffset=10)
@@ -8,8 +8,8 @@ test_configuration
 Tests for `configuration` module.
 """
 
-import copy
 import os
+import pickle
 import sys
 import unittest
 
@@ -20,6 +20,8 @@ from can4python import cansignal
 from can4python import configuration
 from can4python import exceptions
 
+VERBOSE = bool(os.environ.get('CAN4PY_VERBOSE_TESTS'))  # Print output for manual checking
+
 FRAME_ID_SEND = 7
 FRAME_ID_RECEIVE = 12
 NON_EXISTING_FRAME_ID = 99
@@ -50,11 +52,12 @@ TESTCONFIG1.add_framedefinition(fr_def1)
 TESTCONFIG1.add_framedefinition(fr_def2)
 TESTCONFIG1.busname = "bus1"
 TESTCONFIG1.ego_node_ids = ["1", "33", "45A", "A",]
+TESTCONFIG1_PICKLE = pickle.dumps(TESTCONFIG1, protocol=pickle.HIGHEST_PROTOCOL)  # Loads faster than copy.deepcopy()
 
 class TestConfiguration(unittest.TestCase):
 
     def setUp(self):
-        self.config = copy.deepcopy(TESTCONFIG1)
+        self.config = pickle.loads(TESTCONFIG1_PICKLE)
 
     def testConstructor(self):
         config = configuration.Configuration()
@@ -139,7 +142,8 @@ class TestConfiguration(unittest.TestCase):
         
     def testGetDescriptiveAsciiArt(self):
         result = self.config.get_descriptive_ascii_art()
-        print('\n\n' + result)  # Check the output manually
+        if VERBOSE:
+            print('\n\n' + result)  # Check the output manually
 
     def testAddFramedefinition(self):
         config = configuration.Configuration()
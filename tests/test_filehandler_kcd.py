@@ -8,10 +8,10 @@ test_filehandler_kcd
 Tests for `filehandler_kcd` module.
 """
 
-import contextlib
-import copy
 import os
+import pickle
 import sys
+import tempfile
 import unittest
 
 assert sys.version_info >= (3, 3, 0), "Python version 3.3 or later required!"
@@ -22,118 +22,82 @@ from can4python import exceptions
 from can4python import filehandler_kcd
 
 try:
-    from .test_configuration import FRAME_ID_SEND, TESTCONFIG1
+    from .test_configuration import FRAME_ID_SEND, TESTCONFIG1_PICKLE
 except SystemError:  # When running this file directly
-    from test_configuration import FRAME_ID_SEND, TESTCONFIG1
+    from test_configuration import FRAME_ID_SEND, TESTCONFIG1_PICKLE
 
 INPUT_FILENAME = "testfile_input.kcd"
 INPUT_FILENAME_NO_BUSDEFINITION = "testfile_input_no_busdefinition.kcd"
+FRAME_ATTRIBUTES = ('frame_id', 'name', 'dlc', 'frame_format', 'cycletime')
+SIGNAL_ATTRIBUTES = ('signalname', 'startbit', 'numberofbits', 'scalingfactor', 'valueoffset', 'endianness',
+                     'signaltype', 'minvalue', 'maxvalue', 'defaultvalue', 'unit', 'comment')
+
+
+def get_attributes(item, attributenames):
+    """Return a dict with the given attributes of the item, for comparing several attributes at once."""
+    return {name: getattr(item, name) for name in attributenames}
+
 
 class TestConfiguration(unittest.TestCase):
 
-    OUTPUT_FILENAME_1 = "test_out_1_TEMPORARY.kcd"
-    OUTPUT_FILENAME_2 = "test_out_2_TEMPORARY.kcd"
-    OUTPUT_FILENAME_3 = "test_out_3_TEMPORARY.kcd"
-    OUTPUT_FILENAME_10 = "test_out_10_TEMPORARY.kcd"
+    OUTPUT_FILENAME_1 = "test_out_1.kcd"
+    OUTPUT_FILENAME_2 = "test_out_2.kcd"
+    OUTPUT_FILENAME_3 = "test_out_3.kcd"
+    OUTPUT_FILENAME_10 = "test_out_10.kcd"
 
-    def setUp(self):
-        self.config = copy.deepcopy(TESTCONFIG1)
+    @classmethod
+    def setUpClass(cls):
         parent_directory = os.path.dirname(__file__)
-        self.input_filename = os.path.join(parent_directory, INPUT_FILENAME)
-        self.input_filename_no_busdefinition = os.path.join(parent_directory, INPUT_FILENAME_NO_BUSDEFINITION)
+        cls.input_filename = os.path.join(parent_directory, INPUT_FILENAME)
+        cls.input_filename_no_busdefinition = os.path.join(parent_directory, INPUT_FILENAME_NO_BUSDEFINITION)
+
+        # Parse the input file once. Each test loads its own copy of the result.
+        cls.input_config_pickle = pickle.dumps(filehandler_kcd.FilehandlerKcd.read(cls.input_filename, "Mainbus"),
+                                               protocol=pickle.HIGHEST_PROTOCOL)
+
+    def setUp(self):
+        self.output_directory = tempfile.TemporaryDirectory()
+        self.output_filename_1 = os.path.join(self.output_directory.name, self.OUTPUT_FILENAME_1)
+        self.output_filename_2 = os.path.join(self.output_directory.name, self.OUTPUT_FILENAME_2)
+        self.output_filename_3 = os.path.join(self.output_directory.name, self.OUTPUT_FILENAME_3)
+        self.output_filename_10 = os.path.join(self.output_directory.name, self.OUTPUT_FILENAME_10)
 
     def tearDown(self):
-        for filename in [self.OUTPUT_FILENAME_1,
-                         self.OUTPUT_FILENAME_2,
-                         self.OUTPUT_FILENAME_3,
-                         self.OUTPUT_FILENAME_10]:
-            with contextlib.suppress(FileNotFoundError):
-                os.remove(filename)
+        self.output_directory.cleanup()
 
     def testReadKcdFile(self):
-        config = filehandler_kcd.FilehandlerKcd.read(self.input_filename, "Mainbus")
+        config = pickle.loads(self.input_config_pickle)
 
         self.assertEqual(config.busname, "Mainbus")
 
-        self.assertEqual(config.framedefinitions[1].frame_id, 1)
-        self.assertEqual(config.framedefinitions[1].name, 'testframedef1')
-        self.assertEqual(config.framedefinitions[1].dlc, 8)
-        self.assertEqual(config.framedefinitions[1].frame_format, 'standard')
-        self.assertEqual(config.framedefinitions[1].cycletime, None)
-        self.assertEqual(len(config.framedefinitions[1].signaldefinitions), 4)
-
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].signalname, 'testsignal11')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].startbit, 56)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].numberofbits, 1)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].scalingfactor, 1)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].valueoffset, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].endianness, 'little')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].signaltype, 'unsigned')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].minvalue, None)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].maxvalue, None)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].defaultvalue, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].unit, "")
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[0].comment, "")
-
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].signalname, 'testsignal12')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].startbit, 8)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].numberofbits, 16)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].scalingfactor, 1)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].valueoffset, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].endianness, 'little')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].signaltype, 'unsigned')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].minvalue, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].maxvalue, 100)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].defaultvalue, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].unit, 'm/s')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[1].comment, "Test signal number 2")
-
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].signalname, 'testsignal13')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].startbit, 24)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].numberofbits, 16)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].scalingfactor, 1)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].valueoffset, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].endianness, 'little')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].signaltype, 'unsigned')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].minvalue, None)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].maxvalue, None)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].defaultvalue, 0)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].unit, '')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[2].comment, "")
-
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].signalname, 'testsignal14')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].startbit, 40)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].numberofbits, 2)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].scalingfactor, 2)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].valueoffset, 20)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].endianness, 'big')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].signaltype, 'unsigned')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].minvalue, 21)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].maxvalue, 25)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].defaultvalue, 20)
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].unit, 'm/s')
-        self.assertEqual(config.framedefinitions[1].signaldefinitions[3].comment, "Test signal number 4")
+        fr_def = config.framedefinitions[1]
+        self.assertEqual(get_attributes(fr_def, FRAME_ATTRIBUTES),
+                         {'frame_id': 1, 'name': 'testframedef1', 'dlc': 8, 'frame_format': 'standard',
+                          'cycletime': None})
+        self.assertEqual([get_attributes(sig, SIGNAL_ATTRIBUTES) for sig in fr_def.signaldefinitions], [
+            {'signalname': 'testsignal11', 'startbit': 56, 'numberofbits': 1, 'scalingfactor': 1, 'valueoffset': 0,
+             'endianness': 'little', 'signaltype': 'unsigned', 'minvalue': None, 'maxvalue': None,
+             'defaultvalue': 0, 'unit': "", 'comment': ""},
+            {'signalname': 'testsignal12', 'startbit': 8, 'numberofbits': 16, 'scalingfactor': 1, 'valueoffset': 0,
+             'endianness': 'little', 'signaltype': 'unsigned', 'minvalue': 0, 'maxvalue': 100, 'defaultvalue': 0,
+             'unit': 'm/s', 'comment': "Test signal number 2"},
+            {'signalname': 'testsignal13', 'startbit': 24, 'numberofbits': 16, 'scalingfactor': 1,
+             'valueoffset': 0, 'endianness': 'little', 'signaltype': 'unsigned', 'minvalue': None,
+             'maxvalue': None, 'defaultvalue': 0, 'unit': '', 'comment': ""},
+            {'signalname': 'testsignal14', 'startbit': 40, 'numberofbits': 2, 'scalingfactor': 2,
+             'valueoffset': 20, 'endianness': 'big', 'signaltype': 'unsigned', 'minvalue': 21, 'maxvalue': 25,
+             'defaultvalue': 20, 'unit': 'm/s', 'comment': "Test signal number 4"},
+        ])
 
         fr_def = config.framedefinitions[0x12345678]
-        self.assertEqual(fr_def.frame_id, 0x12345678)
-        self.assertEqual(fr_def.name, 'testframedef2')
-        self.assertEqual(fr_def.dlc, 4)
-        self.assertEqual(fr_def.frame_format, 'extended')
-        self.assertEqual(fr_def.cycletime, 50)
-        self.assertEqual(len(fr_def.signaldefinitions), 1)
-
-        self.assertEqual(fr_def.signaldefinitions[0].signalname, 'testsignal21')
-        self.assertEqual(fr_def.signaldefinitions[0].startbit, 5)
-        self.assertEqual(fr_def.signaldefinitions[0].numberofbits, 1)
-        self.assertEqual(fr_def.signaldefinitions[0].scalingfactor, 1)
-        self.assertEqual(fr_def.signaldefinitions[0].valueoffset, 0)
-        self.assertEqual(fr_def.signaldefinitions[0].endianness, 'little')
-        self.assertEqual(fr_def.signaldefinitions[0].signaltype, 'unsigned')
-        self.assertEqual(fr_def.signaldefinitions[0].minvalue, None)
-        self.assertEqual(fr_def.signaldefinitions[0].maxvalue, None)
-        self.assertEqual(fr_def.signaldefinitions[0].defaultvalue, 0)
-        self.assertEqual(fr_def.signaldefinitions[0].unit, "")
-        self.assertEqual(fr_def.signaldefinitions[0].comment, "")
+        self.assertEqual(get_attributes(fr_def, FRAME_ATTRIBUTES),
+                         {'frame_id': 0x12345678, 'name': 'testframedef2', 'dlc': 4, 'frame_format': 'extended',
+                          'cycletime': 50})
+        self.assertEqual([get_attributes(sig, SIGNAL_ATTRIBUTES) for sig in fr_def.signaldefinitions], [
+            {'signalname': 'testsignal21', 'startbit': 5, 'numberofbits': 1, 'scalingfactor': 1, 'valueoffset': 0,
+             'endianness': 'little', 'signaltype': 'unsigned', 'minvalue': None, 'maxvalue': None,
+             'defaultvalue': 0, 'unit': "", 'comment': ""},
+        ])
 
     def testReadKcdFileFaulty(self):
         self.assertRaises(exceptions.CanException,
@@ -148,45 +112,34 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(config.busname, "Mainbus")
 
     def testWriteKcdFile(self):
-        with contextlib.suppress(FileNotFoundError):
-            os.remove(self.OUTPUT_FILENAME_1)
-
-        filehandler_kcd.FilehandlerKcd.write(self.config, self.OUTPUT_FILENAME_1)
-        self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_1))
+        config = pickle.loads(TESTCONFIG1_PICKLE)
+        filehandler_kcd.FilehandlerKcd.write(config, self.output_filename_1)
+        self.assertTrue(os.path.exists(self.output_filename_1))
 
         # TODO: Verify result in more detail
 
     def testSaveLoadedConfigurationToFile(self):
-        with contextlib.suppress(FileNotFoundError):
-            os.remove(self.OUTPUT_FILENAME_2)
-
         config = filehandler_kcd.FilehandlerKcd.read(self.input_filename, None)
         self.assertEqual(config.busname, "Mainbus")
-        filehandler_kcd.FilehandlerKcd.write(config, self.OUTPUT_FILENAME_2)
-        self.assertTrue(os.path.exists(self.OUTPUT_FILENAME_2))
+        filehandler_kcd.FilehandlerKcd.write(config, self.output_filename_2)
+        self.assertTrue(os.path.exists(self.output_filename_2))
 
         # TODO: Check manually that the input and output files are similar
 
     def testWriteKcdFileNoBusnameGiven(self):
-        with contextlib.suppress(FileNotFoundError):
-            os.remove(self.OUTPUT_FILENAME_3)
-
         config = configuration.Configuration()
         self.assertEqual(config.busname, None)
-        filehandler_kcd.FilehandlerKcd.write(config, self.OUTPUT_FILENAME_3)
+        filehandler_kcd.FilehandlerKcd.write(config, self.output_filename_3)
 
-        with open(self.OUTPUT_FILENAME_3, 'r') as file:
+        with open(self.output_filename_3, 'r') as file:
             self.assertTrue(any("Mainbus" in line for line in file.readlines()))
 
     def testWriteKcdFileNoProducerGiven(self):
-        with contextlib.suppress(FileNotFoundError):
-            os.remove(self.OUTPUT_FILENAME_10)
-
         config = configuration.Configuration()
         fr_def = canframe_definition.CanFrameDefinition(1, 'testframedef10')
         config.add_framedefinition(fr_def)
 
-        filehandler_kcd.FilehandlerKcd.write(config, self.OUTPUT_FILENAME_10)
+        filehandler_kcd.FilehandlerKcd.write(config, self.output_filename_10)
 
 
 if __name__ == '__main__':
@@ -8,6 +8,7 @@ test_utilities
 Tests for `utilities` module.
 """
 
+import os
 import sys
 import unittest
 
@@ -16,6 +17,9 @@ assert sys.version_info >= (3, 3, 0), "Python version 3.3 or later required!"
 from can4python import utilities
 from can4python import exceptions
 
+VERBOSE = bool(os.environ.get('CAN4PY_VERBOSE_TESTS'))  # Print output for manual checking
+FULL_SANITY = bool(os.environ.get('CAN4PY_FULL_SANITY'))  # Run the exhaustive sanity checks
+
 
 class TestCalculateBackwardBitnumber(unittest.TestCase):
 
@@ -26,11 +30,11 @@ class TestCalculateBackwardBitnumber(unittest.TestCase):
         (56, 0),
         (63, 7)
     )
+    normal_bitnumbers, backward_bitnumbers = zip(*knownValues)  # Columns of knownValues
 
     def test_known_values(self):
-        for normal, backwards in self.knownValues:
-            result = utilities.calculate_backward_bitnumber(normal)
-            self.assertEqual(result, backwards)
+        results = tuple(map(utilities.calculate_backward_bitnumber, self.normal_bitnumbers))
+        self.assertEqual(results, self.backward_bitnumbers)
 
     def testWrongInputValue(self):
         self.assertRaises(exceptions.CanException, utilities.calculate_backward_bitnumber, -1)
@@ -40,11 +44,11 @@ class TestCalculateBackwardBitnumber(unittest.TestCase):
 class TestCalculateNormalBitnumber(unittest.TestCase):
 
     knownValues = TestCalculateBackwardBitnumber.knownValues
+    normal_bitnumbers, backward_bitnumbers = zip(*knownValues)  # Columns of knownValues
 
     def test_known_values(self):
-        for normal, backwards in self.knownValues:
-            result = utilities.calculate_normal_bitnumber(backwards)
-            self.assertEqual(normal, result)
+        results = tuple(map(utilities.calculate_normal_bitnumber, self.backward_bitnumbers))
+        self.assertEqual(results, self.normal_bitnumbers)
 
     def testWrongInputValue(self):
         self.assertRaises(exceptions.CanException, utilities.calculate_normal_bitnumber, -1)
@@ -54,10 +58,10 @@ class TestCalculateNormalBitnumber(unittest.TestCase):
 class TestSanityBitnumber(unittest.TestCase):
 
     def test_known_values(self):
-        for normal_bitnumber in range(64):
-            backward_bitnumber = utilities.calculate_backward_bitnumber(normal_bitnumber)
-            result = utilities.calculate_normal_bitnumber(backward_bitnumber)
-            self.assertEqual(result, normal_bitnumber)
+        normal_bitnumbers = list(range(64))
+        backward_bitnumbers = list(map(utilities.calculate_backward_bitnumber, normal_bitnumbers))
+        results = list(map(utilities.calculate_normal_bitnumber, backward_bitnumbers))
+        self.assertEqual(results, normal_bitnumbers)
 
 
 class TestGenerateBitByteOverview(unittest.TestCase):
@@ -69,8 +73,11 @@ class TestGenerateBitByteOverview(unittest.TestCase):
         utilities.generate_bit_byte_overview(inputstring, 10)
         
         result = utilities.generate_bit_byte_overview(inputstring, 4, True)
-        print("\n\nOutput from generate_bit_byte_overview('1' + ' '*63, 4, True):")   
-        print(result)  # Check the output manually
+        self.assertIsInstance(result, str)
+        self.assertIn('1', result)
+        if VERBOSE:
+            print("\n\nOutput from generate_bit_byte_overview('1' + ' '*63, 4, True):")
+            print(result)  # Check the output manually
 
     def testWrongInputValue(self):
         self.assertRaises(ValueError, utilities.generate_bit_byte_overview, '001')
@@ -80,8 +87,11 @@ class TestGenerateCanIntegerOverview(unittest.TestCase):
 
     def test_known_values(self):
         result = utilities.generate_can_integer_overview(1)
-        print('\n\nOutput from generate_can_integer_overview(1):')   # Check the output manually
-        print(result)
+        self.assertIsInstance(result, str)
+        self.assertIn('1', result)
+        if VERBOSE:
+            print('\n\nOutput from generate_can_integer_overview(1):')  # Check the output manually
+            print(result)
 
 
 class TestBytesToInt(unittest.TestCase):
@@ -98,11 +108,11 @@ class TestBytesToInt(unittest.TestCase):
         (b"\x00\x00\x00\x00\x01\x00\x00\x00", 16777216),
         (b"\x00\x00\x00\x01\x00\x00\x00\x00", 4294967296),
     )
+    inputvalues, knownresults = zip(*knownValues)  # Columns of knownValues
 
     def testKnownValues(self):
-        for inputvalue, knownresult in self.knownValues:
-            result = utilities.can_bytes_to_int(inputvalue)
-            self.assertEqual(result, knownresult)
+        results = list(map(utilities.can_bytes_to_int, self.inputvalues))
+        self.assertEqual(results, list(self.knownresults))
 
 
 class TestIntToBytes(unittest.TestCase):
@@ -113,9 +123,9 @@ class TestIntToBytes(unittest.TestCase):
     )
 
     def testKnownValues(self):
-        for inputvalue, number_of_bytes, knownresult in self.knownValues:
-            result = utilities.int_to_can_bytes(number_of_bytes, inputvalue)
-            self.assertEqual(result, knownresult)
+        results = [utilities.int_to_can_bytes(number_of_bytes, inputvalue)
+                   for inputvalue, number_of_bytes, _ in self.knownValues]
+        self.assertEqual(results, [knownresult for _, _, knownresult in self.knownValues])
 
 
 class TestTwosComplement(unittest.TestCase):
@@ -140,18 +150,20 @@ class TestTwosComplement(unittest.TestCase):
         (2, 8, 2),
         (126, 8, 126),
         (127, 8, 127),
+        (-1, 65, (2 ** 65) - 1),
+        (-(2 ** 64), 65, 2 ** 64),
+        ((2 ** 64) - 1, 65, (2 ** 64) - 1),
     )
+    inputvalues, numbers_of_bits, knownresults = zip(*knownValues)  # Columns of knownValues
 
     def testKnownValues(self):
-        for inputvalue, numberofbits, knownresult in self.knownValues:
-            result = utilities.twos_complement(inputvalue, numberofbits)
-            self.assertEqual(result, knownresult)
+        results = list(map(utilities.twos_complement, self.inputvalues, self.numbers_of_bits))
+        self.assertEqual(results, list(self.knownresults))
 
     def testWrongInputValue(self):
-        self.assertRaises(exceptions.CanException, utilities.twos_complement, 4, 3)
-        self.assertRaises(exceptions.CanException, utilities.twos_complement, -5, 3)
-        self.assertRaises(exceptions.CanException, utilities.twos_complement, 128, 8)
-        self.assertRaises(exceptions.CanException, utilities.twos_complement, -129, 8)
+        for wrong_arguments in [(4, 3), (-5, 3), (128, 8), (-129, 8), (0, 0), (2 ** 64, 65)]:
+            with self.assertRaises(exceptions.CanException, msg=repr(wrong_arguments)):
+                utilities.twos_complement(*wrong_arguments)
 
 
 class TestFromTwosComplement(unittest.TestCase):
@@ -159,24 +171,33 @@ class TestFromTwosComplement(unittest.TestCase):
     knownValues = TestTwosComplement.knownValues
 
     def testKnownValues(self):
-        for knownresult, numberofbits, inputvalue in self.knownValues:
-            result = utilities.from_twos_complement(inputvalue, numberofbits)
-            self.assertEqual(result, knownresult)
+        results = [utilities.from_twos_complement(inputvalue, numberofbits)
+                   for _, numberofbits, inputvalue in self.knownValues]
+        self.assertEqual(results, [knownresult for knownresult, _, _ in self.knownValues])
 
     def testWrongInputValue(self):
-        self.assertRaises(exceptions.CanException, utilities.from_twos_complement, 8, 3)
-        self.assertRaises(exceptions.CanException, utilities.from_twos_complement, -1, 3)
-        self.assertRaises(exceptions.CanException, utilities.from_twos_complement, 256, 8)
-        self.assertRaises(exceptions.CanException, utilities.from_twos_complement, -1, 8)
+        for wrong_arguments in [(8, 3), (-1, 3), (256, 8), (-1, 8), (0, 0), (2 ** 65, 65)]:
+            with self.assertRaises(exceptions.CanException, msg=repr(wrong_arguments)):
+                utilities.from_twos_complement(*wrong_arguments)
 
 
 class TestTwosComplementSanity(unittest.TestCase):
 
+    def check_round_trip(self, bits):
+        twos_complement = utilities.twos_complement  # Local names, as this runs for up to 8192 values per call
+        from_twos_complement = utilities.from_twos_complement
+        inputvalues = list(range(2 ** bits))
+        results = [twos_complement(from_twos_complement(inputvalue, bits), bits) for inputvalue in inputvalues]
+        self.assertEqual(results, inputvalues)
+
+    def testSanitySubset(self):
+        for bits in (1, 4, 8, 13):
+            self.check_round_trip(bits)
+
+    @unittest.skipUnless(FULL_SANITY, "Set CAN4PY_FULL_SANITY to check all field sizes")
     def testSanity(self):
         for bits in range(1, 14):
-            for inputvalue in range(2 ** bits):
-                result = utilities.twos_complement(utilities.from_twos_complement(inputvalue, bits), bits)
-                self.assertEqual(result, inputvalue)
+            self.check_round_trip(bits)
 
 
 class TestSplitSeconds(unittest.TestCase):
@@ -195,22 +216,25 @@ class TestSplitSeconds(unittest.TestCase):
         (1.25, 1, 250000),
         (99.99, 99, 990000),
         (100000.1, 100000, 100000),
+        (0.9999996, 1, 0),  # Rounded up to a full second
+        (1.9999999, 2, 0),
     )
 
     def testKnownValues(self):
         USECONDS_DELTA = 1
-        for inputvalue, known_seconds_full, known_useconds in self.knownValues:
-            result_seconds_full, result_useconds = utilities.split_seconds_to_full_and_part(inputvalue)
+        results = [utilities.split_seconds_to_full_and_part(inputvalue) for inputvalue, _, _ in self.knownValues]
 
-            self.assertEqual(result_seconds_full, known_seconds_full)
-            self.assertLessEqual(result_useconds, known_useconds + USECONDS_DELTA)
-            self.assertGreaterEqual(result_useconds, known_useconds - USECONDS_DELTA)
+        self.assertEqual([result_seconds_full for result_seconds_full, _ in results],
+                         [known_seconds_full for _, known_seconds_full, _ in self.knownValues])
+        wrong_useconds = [(inputvalue, result_useconds)
+                          for (inputvalue, _, known_useconds), (_, result_useconds) in zip(self.knownValues, results)
+                          if abs(result_useconds - known_useconds) > USECONDS_DELTA]
+        self.assertEqual(wrong_useconds, [])
 
     def testWrongInputValue(self):
-        self.assertRaises(exceptions.CanException, utilities.split_seconds_to_full_and_part, -0.001)
-        self.assertRaises(exceptions.CanException, utilities.split_seconds_to_full_and_part, -1)
-        self.assertRaises(exceptions.CanException, utilities.split_seconds_to_full_and_part, -1.0)
-        self.assertRaises(exceptions.CanException, utilities.split_seconds_to_full_and_part, -1000)
+        for wrong_value in [-0.001, -1, -1.0, -1000]:
+            with self.assertRaises(exceptions.CanException, msg=repr(wrong_value)):
+                utilities.split_seconds_to_full_and_part(wrong_value)
 
 
 class TestCheckFrameId(unittest.TestCase):
@@ -224,12 +248,10 @@ class TestCheckFrameId(unittest.TestCase):
         utilities.check_frame_id_and_format(0x1FFFFFFF, 'extended')
 
     def testWrongInputValue(self):
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, None, 'standard')
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, None, 'extended')
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, -1, 'standard')
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, -1, 'extended')
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, 0x800, 'standard')
-        self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, 0x20000000, 'extended')
+        for wrong_arguments in [(None, 'standard'), (None, 'extended'), (-1, 'standard'), (-1, 'extended'),
+                                (0x800, 'standard'), (0x20000000, 'extended')]:
+            with self.assertRaises(exceptions.CanException, msg=repr(wrong_arguments)):
+                utilities.check_frame_id_and_format(*wrong_arguments)
 
     def testWrongInputType(self):
         self.assertRaises(exceptions.CanException, utilities.check_frame_id_and_format, "ABC", 'standard')
@@ -255,14 +277,20 @@ class TestGetBusvalueFromBytes(unittest.TestCase):
         (b"\x00\x00\x00\x02\x01\x00\x00\x00", 'little', 16, 24, 256 + 2),
     )
 
-    def testKnownValues(self):
-        for input_bytes, endianness, numberofbits, startbit, known_busvalue in self.knownValues:
-            result_busvalue = utilities.get_busvalue_from_bytes(input_bytes, endianness, numberofbits, startbit)
-            self.assertEqual(result_busvalue, known_busvalue)
+    # These bytes have also other bits set.
+    knownValuesOtherBitsSet = (
+        (b"\x00\x00\x00\xFF\xFF\x00\x00\x00", 'big', 8, 32, 255),
+        (b"\x00\x00\x00\xFF\xFF\x00\x00\x00", 'big', 16, 32, 65535),
+    )
 
-        # These bytes have also other bits set.
-        self.assertEqual(utilities.get_busvalue_from_bytes(b"\x00\x00\x00\xFF\xFF\x00\x00\x00", 'big', 8, 32), 255)
-        self.assertEqual(utilities.get_busvalue_from_bytes(b"\x00\x00\x00\xFF\xFF\x00\x00\x00", 'big', 16, 32), 65535)
+    # Columns of all known values
+    inputvalues, endiannesses, numbers_of_bits, startbits, known_busvalues = \
+        zip(*(knownValues + knownValuesOtherBitsSet))
+
+    def testKnownValues(self):
+        results = list(map(utilities.get_busvalue_from_bytes,
+                           self.inputvalues, self.endiannesses, self.numbers_of_bits, self.startbits))
+        self.assertEqual(results, list(self.known_busvalues))
 
 
 class TestGetShiftedvalueFromBusvalue(unittest.TestCase):
@@ -270,9 +298,9 @@ class TestGetShiftedvalueFromBusvalue(unittest.TestCase):
     knownValues = TestGetBusvalueFromBytes.knownValues
 
     def testKnownValues(self):
-        for known_bytes, endianness, numberofbits, startbit, input_busvalue in self.knownValues:
-            result_shiftedvalue = utilities.get_shiftedvalue_from_busvalue(input_busvalue, endianness, numberofbits, startbit)
-            self.assertEqual(result_shiftedvalue, utilities.can_bytes_to_int(known_bytes))
+        results = [utilities.get_shiftedvalue_from_busvalue(input_busvalue, endianness, numberofbits, startbit)
+                   for _, endianness, numberofbits, startbit, input_busvalue in self.knownValues]
+        self.assertEqual(results, [utilities.can_bytes_to_int(known_bytes) for known_bytes, *_ in self.knownValues])
 
 
 if __name__ == '__main__':